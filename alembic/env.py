@@ -16,6 +16,7 @@ from app.models import (
     CallRecord,
     AnalysisResult,
     EmotionData,
+    DashboardDailyStats,
 )
 
 config = context.config
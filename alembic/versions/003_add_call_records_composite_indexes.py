@@ -0,0 +1,82 @@
+"""Add composite indexes for call_records dashboard queries
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-03 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_call_records_tenant_event",
+            "call_records",
+            ["tenant_id", sa.text("event_datetime DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_call_records_tenant_operator_event",
+            "call_records",
+            ["tenant_id", "operator_id", "event_datetime"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_call_records_pending",
+            "call_records",
+            ["tenant_id", "event_datetime"],
+            unique=False,
+            postgresql_where=sa.text("analysis_status IN ('PENDING', 'PROCESSING')"),
+            postgresql_concurrently=True,
+        )
+
+        # Superseded by the composite indexes above
+        op.drop_index(
+            "ix_call_records_event_datetime",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_call_records_analysis_status",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_call_records_analysis_status",
+            "call_records",
+            ["analysis_status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_call_records_event_datetime",
+            "call_records",
+            ["event_datetime"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_call_records_pending", table_name="call_records", postgresql_concurrently=True)
+        op.drop_index(
+            "ix_call_records_tenant_operator_event",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_call_records_tenant_event", table_name="call_records", postgresql_concurrently=True)
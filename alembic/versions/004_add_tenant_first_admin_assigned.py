@@ -0,0 +1,35 @@
+"""Add first_admin_assigned flag to tenants
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-04 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tenants",
+        sa.Column("first_admin_assigned", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+    # Tenants that already have users have had their first admin assigned
+    op.execute("""
+        UPDATE tenants SET first_admin_assigned = TRUE
+        WHERE EXISTS (SELECT 1 FROM users WHERE users.tenant_id = tenants.id)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("tenants", "first_admin_assigned")
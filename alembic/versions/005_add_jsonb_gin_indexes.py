@@ -0,0 +1,37 @@
+"""Add GIN jsonb_path_ops indexes for JSONB containment queries
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-05 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_operation_flows_flow_definition_gin "
+            "ON operation_flows USING GIN (flow_definition jsonb_path_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_analysis_results_compliance_details_gin "
+            "ON analysis_results USING GIN (compliance_details jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_analysis_results_compliance_details_gin")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_operation_flows_flow_definition_gin")
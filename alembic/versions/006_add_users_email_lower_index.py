@@ -0,0 +1,50 @@
+"""Add unique lower(email) index for case-insensitive login lookups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-06 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Emails differing only by case would fail the build with a bare unique
+    # violation; list them instead so they can be merged or renamed first.
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT lower(email), string_agg(email, ', ' ORDER BY email) FROM users "
+            "GROUP BY lower(email) HAVING count(*) > 1 "
+            "ORDER BY lower(email) LIMIT 20"
+        )
+    ).all()
+    if duplicates:
+        listing = "\n".join(f"  {emails}" for _, emails in duplicates)
+        raise RuntimeError(
+            "users has emails that differ only by case; resolve them "
+            f"before upgrading (showing up to 20):\n{listing}"
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        # Clear an INVALID index left by an interrupted earlier attempt
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY ix_users_email_lower "
+            "ON users (lower(email))"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
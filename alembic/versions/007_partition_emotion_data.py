@@ -0,0 +1,111 @@
+"""Partition emotion_data by created_at month
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-01-07 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Creates one monthly partition, e.g. emotion_data_2024m01. Called here and
+    # by the ensure_partitions periodic task to stay ahead of incoming data.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_monthly_partition(parent regclass, month_start date)
+        RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            start_date date := date_trunc('month', month_start)::date;
+            partition_name text := format('%s_%s', parent::text, to_char(start_date, 'YYYY"m"MM'));
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, start_date, (start_date + interval '1 month')::date
+            );
+        END;
+        $$
+    """)
+
+    op.rename_table("emotion_data", "emotion_data_unpartitioned")
+    op.execute("ALTER INDEX ix_emotion_data_analysis_id RENAME TO ix_emotion_data_unpartitioned_analysis_id")
+    op.execute("ALTER TABLE emotion_data_unpartitioned RENAME CONSTRAINT emotion_data_pkey TO emotion_data_unpartitioned_pkey")
+
+    # The partition key must be part of the primary key
+    op.create_table(
+        "emotion_data",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("analysis_id", sa.UUID(), nullable=False),
+        sa.Column("timestamp", sa.Float(), nullable=False),
+        sa.Column("emotion_type", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("audio_features", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["analysis_id"], ["analysis_results.id"]),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(op.f("ix_emotion_data_analysis_id"), "emotion_data", ["analysis_id"], unique=False)
+
+    # Partitions covering existing rows plus the next three months
+    op.execute("""
+        SELECT create_monthly_partition('emotion_data', month::date)
+        FROM generate_series(
+            date_trunc('month', LEAST(
+                COALESCE((SELECT min(created_at) FROM emotion_data_unpartitioned), now()),
+                now()
+            )),
+            date_trunc('month', now()) + interval '3 months',
+            interval '1 month'
+        ) AS month
+    """)
+    # Catch-all so inserts never fail if the periodic task falls behind
+    op.execute("CREATE TABLE emotion_data_default PARTITION OF emotion_data DEFAULT")
+
+    op.execute("""
+        INSERT INTO emotion_data
+            (id, analysis_id, timestamp, emotion_type, confidence, audio_features, created_at)
+        SELECT id, analysis_id, timestamp, emotion_type, confidence, audio_features, created_at
+        FROM emotion_data_unpartitioned
+    """)
+    op.drop_index("ix_emotion_data_unpartitioned_analysis_id", table_name="emotion_data_unpartitioned")
+    op.drop_table("emotion_data_unpartitioned")
+
+
+def downgrade() -> None:
+    op.rename_table("emotion_data", "emotion_data_partitioned")
+    op.execute("ALTER INDEX ix_emotion_data_analysis_id RENAME TO ix_emotion_data_partitioned_analysis_id")
+
+    op.create_table(
+        "emotion_data",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("analysis_id", sa.UUID(), nullable=False),
+        sa.Column("timestamp", sa.Float(), nullable=False),
+        sa.Column("emotion_type", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("audio_features", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["analysis_id"], ["analysis_results.id"]),
+        sa.PrimaryKeyConstraint("id", name="emotion_data_pkey"),
+    )
+    op.execute("""
+        INSERT INTO emotion_data
+            (id, analysis_id, timestamp, emotion_type, confidence, audio_features, created_at)
+        SELECT id, analysis_id, timestamp, emotion_type, confidence, audio_features, created_at
+        FROM emotion_data_partitioned
+    """)
+    op.create_index(op.f("ix_emotion_data_analysis_id"), "emotion_data", ["analysis_id"], unique=False)
+
+    # Dropping the parent drops all of its partitions
+    op.drop_table("emotion_data_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS create_monthly_partition(regclass, date)")
@@ -0,0 +1,44 @@
+"""Add dashboard_daily_stats rollup table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-01-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_daily_stats",
+        sa.Column("tenant_id", sa.UUID(), nullable=False),
+        sa.Column("operator_id", sa.UUID(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("analyzed_calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("fillers_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("silence_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("compliance_checked_calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("compliant_calls", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.PrimaryKeyConstraint("tenant_id", "operator_id", "day"),
+    )
+    # Trend queries scan a tenant's days without an operator filter
+    op.create_index("ix_dashboard_daily_stats_tenant_day", "dashboard_daily_stats", ["tenant_id", "day"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_daily_stats_tenant_day", table_name="dashboard_daily_stats")
+    op.drop_table("dashboard_daily_stats")
@@ -0,0 +1,86 @@
+"""Store enum columns as SMALLINT codes with CHECK constraints
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-01-09 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type, stored labels in code order, check constraint)
+# Code order must match the declaration order of the Python enums.
+ENUM_COLUMNS = [
+    (
+        "users", "role", "userrole",
+        ["ADMIN", "SV", "QA", "OPERATOR", "EXECUTIVE"],
+        "ck_users_role",
+    ),
+    (
+        "call_records", "analysis_status", "analysisstatus",
+        ["PENDING", "PROCESSING", "COMPLETED", "FAILED"],
+        "ck_call_records_analysis_status",
+    ),
+    (
+        "analysis_prompts", "prompt_type", "prompttype",
+        ["quality_score", "summary", "emotion", "flow_classification", "flow_compliance", "custom"],
+        "ck_analysis_prompts_prompt_type",
+    ),
+]
+
+
+def _to_code(column: str, labels: list[str]) -> str:
+    whens = " ".join(f"WHEN '{label.upper()}' THEN {code}" for code, label in enumerate(labels))
+    return f"CASE upper({column}::text) {whens} END"
+
+
+def _to_label(column: str, labels: list[str], enum_type: str) -> str:
+    whens = " ".join(f"WHEN {code} THEN '{label}'" for code, label in enumerate(labels))
+    return f"(CASE {column} {whens} END)::{enum_type}"
+
+
+def upgrade() -> None:
+    # The partial index predicate compares against enum labels and cannot survive the type change
+    op.drop_index("ix_call_records_pending", table_name="call_records")
+
+    for table, column, enum_type, labels, check in ENUM_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE smallint "
+            f"USING {_to_code(column, labels)}"
+        )
+        op.create_check_constraint(check, table, f"{column} BETWEEN 0 AND {len(labels) - 1}")
+        op.execute(f"DROP TYPE IF EXISTS {enum_type}")
+
+    op.create_index(
+        "ix_call_records_pending",
+        "call_records",
+        ["tenant_id", "event_datetime"],
+        postgresql_where="analysis_status IN (0, 1)",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_call_records_pending", table_name="call_records")
+
+    for table, column, enum_type, labels, check in ENUM_COLUMNS:
+        op.drop_constraint(check, table, type_="check")
+        quoted = ", ".join(f"'{label}'" for label in labels)
+        op.execute(f"CREATE TYPE {enum_type} AS ENUM ({quoted})")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_type} "
+            f"USING {_to_label(column, labels, enum_type)}"
+        )
+
+    op.create_index(
+        "ix_call_records_pending",
+        "call_records",
+        ["tenant_id", "event_datetime"],
+        postgresql_where="analysis_status IN ('PENDING', 'PROCESSING')",
+    )
@@ -0,0 +1,34 @@
+"""Replace analysis_prompts prompt_type index with partial composite index
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-01-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ix_analysis_prompts_tenant_id stays for admin listings
+    op.create_index(
+        "ix_prompts_tenant_type_active",
+        "analysis_prompts",
+        ["tenant_id", "prompt_type"],
+        unique=False,
+        postgresql_where=sa.text("is_active AND is_default"),
+    )
+    op.drop_index(op.f("ix_analysis_prompts_prompt_type"), table_name="analysis_prompts")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_analysis_prompts_prompt_type"), "analysis_prompts", ["prompt_type"], unique=False)
+    op.drop_index("ix_prompts_tenant_type_active", table_name="analysis_prompts")
@@ -0,0 +1,52 @@
+"""Add id tiebreaker to call_records tenant/event index for keyset pagination
+
+Revision ID: 011
+Revises: 010
+Create Date: 2024-01-11 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_call_records_tenant_event_id",
+            "call_records",
+            ["tenant_id", sa.text("event_datetime DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_call_records_tenant_event",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+    op.execute("ALTER INDEX ix_call_records_tenant_event_id RENAME TO ix_call_records_tenant_event")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_call_records_tenant_event_old",
+            "call_records",
+            ["tenant_id", sa.text("event_datetime DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_call_records_tenant_event",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+    op.execute("ALTER INDEX ix_call_records_tenant_event_old RENAME TO ix_call_records_tenant_event")
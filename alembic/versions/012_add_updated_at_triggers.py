@@ -0,0 +1,51 @@
+"""Maintain updated_at with a BEFORE UPDATE trigger
+
+Revision ID: 012
+Revises: 011
+Create Date: 2024-01-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    "tenants",
+    "users",
+    "operators",
+    "operation_flows",
+    "analysis_prompts",
+    "call_records",
+    "analysis_results",
+    "dashboard_daily_stats",
+]
+
+
+def upgrade() -> None:
+    # Columns are naive UTC timestamps, matching datetime.utcnow() on insert
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.updated_at := now() AT TIME ZONE 'utc';
+            RETURN NEW;
+        END;
+        $$
+    """)
+    for table in TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
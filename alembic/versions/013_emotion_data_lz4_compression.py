@@ -0,0 +1,27 @@
+"""Compress emotion_data.audio_features with LZ4
+
+Revision ID: 013
+Revises: 012
+Create Date: 2024-01-13 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Requires PostgreSQL 14+. Recurses to existing partitions, and partitions
+    # created later inherit the setting. Only newly written values use LZ4;
+    # existing rows keep pglz until rewritten.
+    op.execute("ALTER TABLE emotion_data ALTER COLUMN audio_features SET COMPRESSION lz4")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE emotion_data ALTER COLUMN audio_features SET COMPRESSION pglz")
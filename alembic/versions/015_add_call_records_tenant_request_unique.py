@@ -0,0 +1,60 @@
+"""Add unique (tenant_id, request_id) constraint to call_records
+
+Revision ID: 015
+Revises: 014
+Create Date: 2024-01-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicates would make the concurrent build fail halfway and leave an
+    # INVALID index behind; they are reported rather than deleted because each
+    # row may already carry analysis results.
+    duplicates = op.get_bind().execute(
+        sa.text(
+            "SELECT tenant_id, request_id, count(*) FROM call_records "
+            "WHERE request_id IS NOT NULL "
+            "GROUP BY tenant_id, request_id HAVING count(*) > 1 "
+            "ORDER BY count(*) DESC LIMIT 20"
+        )
+    ).all()
+    if duplicates:
+        listing = "\n".join(
+            f"  tenant_id={tenant_id} request_id={request_id} rows={count}"
+            for tenant_id, request_id, count in duplicates
+        )
+        raise RuntimeError(
+            "call_records has duplicate (tenant_id, request_id) pairs; resolve them "
+            f"before upgrading (showing up to 20):\n{listing}"
+        )
+
+    # Build the index without blocking writes, then attach it as the constraint
+    with op.get_context().autocommit_block():
+        # Clear an INVALID index left by an interrupted earlier attempt
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_call_records_tenant_request")
+        op.create_index(
+            "uq_call_records_tenant_request",
+            "call_records",
+            ["tenant_id", "request_id"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+    op.execute(
+        "ALTER TABLE call_records ADD CONSTRAINT uq_call_records_tenant_request "
+        "UNIQUE USING INDEX uq_call_records_tenant_request"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_call_records_tenant_request", "call_records", type_="unique")
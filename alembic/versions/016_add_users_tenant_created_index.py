@@ -0,0 +1,38 @@
+"""Add users (tenant_id, created_at, id) index for list_users keyset pagination
+
+Revision ID: 016
+Revises: 015
+Create Date: 2024-01-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_tenant_created_id",
+            "users",
+            ["tenant_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_tenant_created_id",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
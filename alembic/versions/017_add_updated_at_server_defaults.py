@@ -0,0 +1,51 @@
+"""Default updated_at to the database's UTC clock
+
+Revision ID: 017
+Revises: 016
+Create Date: 2024-01-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "tenants",
+    "users",
+    "operators",
+    "operation_flows",
+    "analysis_prompts",
+    "call_records",
+    "analysis_results",
+    "dashboard_daily_stats",
+)
+
+
+def upgrade() -> None:
+    # Catalog-only change; existing rows are not rewritten
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "updated_at",
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+            server_default=sa.text("timezone('utc', now())"),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "updated_at",
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+            server_default=None,
+        )
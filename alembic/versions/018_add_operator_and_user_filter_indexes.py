@@ -0,0 +1,64 @@
+"""Add composite indexes for the Biztel operator lookup and list_users filters
+
+Revision ID: 018
+Revises: 017
+Create Date: 2024-01-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_operators_tenant_biztel",
+            "operators",
+            ["tenant_id", "biztel_operator_id"],
+            unique=False,
+            postgresql_include=["id"],
+            postgresql_concurrently=True,
+        )
+        # Superseded: no query looks up biztel_operator_id across tenants
+        op.drop_index(
+            "ix_operators_biztel_operator_id",
+            table_name="operators",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_tenant_active_created",
+            "users",
+            ["tenant_id", "is_active", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_tenant_active_created",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_operators_biztel_operator_id",
+            "operators",
+            ["biztel_operator_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_operators_tenant_biztel",
+            table_name="operators",
+            postgresql_concurrently=True,
+        )
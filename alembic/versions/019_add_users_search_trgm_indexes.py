@@ -0,0 +1,38 @@
+"""Add pg_trgm GIN indexes for the list_users email/name search
+
+Revision ID: 019
+Revises: 018
+Create Date: 2024-01-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_trgm "
+            "ON users USING GIN (email gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_name_trgm "
+            "ON users USING GIN (name gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_name_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_trgm")
@@ -0,0 +1,52 @@
+"""Drop call_records single-column indexes covered by composite indexes
+
+Revision ID: 020
+Revises: 019
+Create Date: 2024-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # tenant_id leads ix_call_records_tenant_event and the other composites
+        op.drop_index(
+            "ix_call_records_tenant_id",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+        # request_id is only looked up per tenant, via uq_call_records_tenant_request
+        op.drop_index(
+            "ix_call_records_request_id",
+            table_name="call_records",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_call_records_request_id",
+            "call_records",
+            ["request_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_call_records_tenant_id",
+            "call_records",
+            ["tenant_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,83 @@
+"""Move default-partition rows into newly created monthly partitions
+
+Revision ID: 021
+Revises: 020
+Create Date: 2024-01-21 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Once rows for a month have landed in the DEFAULT partition, creating that
+# month's partition fails ("updated partition constraint for default partition
+# would be violated"). Detach the default, create the partition, move the
+# month's rows out of the default and re-attach it.
+CREATE_MONTHLY_PARTITION = """
+    CREATE OR REPLACE FUNCTION create_monthly_partition(parent regclass, month_start date)
+    RETURNS void LANGUAGE plpgsql AS $$
+    DECLARE
+        start_date date := date_trunc('month', month_start)::date;
+        end_date date := (date_trunc('month', month_start) + interval '1 month')::date;
+        partition_name text := format('%s_%s', parent::text, to_char(start_date, 'YYYY"m"MM'));
+        default_partition regclass;
+        key_column name;
+    BEGIN
+        IF to_regclass(partition_name) IS NOT NULL THEN
+            RETURN;
+        END IF;
+
+        SELECT NULLIF(pt.partdefid, 0)::regclass, a.attname
+        INTO default_partition, key_column
+        FROM pg_partitioned_table pt
+        JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+        WHERE pt.partrelid = parent;
+
+        IF default_partition IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE %s DETACH PARTITION %s', parent, default_partition);
+        END IF;
+
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+            partition_name, parent, start_date, end_date
+        );
+
+        IF default_partition IS NOT NULL THEN
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %s WHERE %I >= %L AND %I < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                default_partition, key_column, start_date, key_column, end_date, partition_name
+            );
+            EXECUTE format('ALTER TABLE %s ATTACH PARTITION %s DEFAULT', parent, default_partition);
+        END IF;
+    END;
+    $$
+"""
+
+
+def upgrade() -> None:
+    op.execute(CREATE_MONTHLY_PARTITION)
+
+
+def downgrade() -> None:
+    # Definition from revision 007
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_monthly_partition(parent regclass, month_start date)
+        RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            start_date date := date_trunc('month', month_start)::date;
+            partition_name text := format('%s_%s', parent::text, to_char(start_date, 'YYYY"m"MM'));
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, start_date, (start_date + interval '1 month')::date
+            );
+        END;
+        $$
+    """)
@@ -1,22 +1,43 @@
-from collections.abc import AsyncGenerator
-from typing import Annotated
+from typing import Annotated, TypeVar
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import SQLModel
 
-from app.config import settings
 from app.database import get_session
+from app.models.tenant import Tenant
 from app.models.user import User, UserRole
+from app.services.auth import decode_token, get_user_with_tenant_by_id
 
 security = HTTPBearer()
 
+ModelT = TypeVar("ModelT", bound=SQLModel)
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async for session in get_session():
-        yield session
+# Tenants are cached per process for the settings endpoints; their Biztel
+# credentials change rarely and updates in this process drop the entry.
+TENANT_CACHE_TTL_SECONDS = 60
+_tenant_cache: TTLCache[str, Tenant] = TTLCache(maxsize=1_000, ttl=TENANT_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_tenant(tenant_id: object) -> None:
+    """Drop a tenant from the tenant cache."""
+    _tenant_cache.pop(str(tenant_id), None)
+
+
+def _detached_copy(instance: ModelT) -> ModelT:
+    """Snapshot a loaded row so it can be merged into later sessions."""
+    snapshot = type(instance)(**instance.model_dump())
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+# FastAPI resolves a dependency once per request and shares the result, so
+# every Depends(get_db) in one request gets the same session. Aliasing saves
+# the extra async generator layer a wrapper would add to each request.
+get_db = get_session
 
 
 async def get_current_user(
@@ -28,23 +49,17 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    payload = decode_token(credentials.credentials)
+    if payload is None:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if user is None:
+    # Read on every request: is_active, role and password_hash must not lag
+    # behind writes made through other workers. The tenant rides along, so
+    # get_current_tenant needs no second query.
+    row = await get_user_with_tenant_by_id(db, payload.sub)
+    if row is None:
         raise credentials_exception
+    user, _ = row
     return user
 
 
@@ -59,6 +74,27 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_tenant(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> Tenant:
+    tenant_id = str(current_user.tenant_id)
+    cached = _tenant_cache.get(tenant_id)
+    if cached is not None:
+        # load=False attaches the snapshot without emitting a SELECT
+        return await db.merge(cached, load=False)
+
+    # Usually already in the identity map from get_current_user's joined load
+    tenant = await db.get(Tenant, current_user.tenant_id)
+    if tenant is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tenant not found",
+        )
+    _tenant_cache[tenant_id] = _detached_copy(tenant)
+    return tenant
+
+
 def require_roles(*roles: UserRole):
     async def role_checker(
         current_user: Annotated[User, Depends(get_current_active_user)],
@@ -78,3 +114,4 @@ CurrentUser = Annotated[User, Depends(get_current_active_user)]
 AdminUser = Annotated[User, Depends(require_roles(UserRole.ADMIN))]
 SupervisorUser = Annotated[User, Depends(require_roles(UserRole.ADMIN, UserRole.SV))]
 QAUser = Annotated[User, Depends(require_roles(UserRole.ADMIN, UserRole.SV, UserRole.QA))]
+CurrentTenant = Annotated[Tenant, Depends(get_current_tenant)]
@@ -0,0 +1,25 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque cursor."""
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_value, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
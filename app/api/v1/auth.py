@@ -1,6 +1,8 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_active_user
@@ -16,13 +18,15 @@ from app.schemas.auth import (
 )
 from app.services.auth import (
     authenticate_user,
+    claim_first_admin,
     create_tenant,
     create_tokens,
     create_user,
     decode_token,
+    email_exists,
     get_or_create_tenant_for_google_user,
-    get_user_by_email,
-    get_user_by_google_id,
+    get_user_by_id,
+    get_user_for_google_login,
     verify_google_token,
 )
 
@@ -31,19 +35,30 @@ router = APIRouter()
 
 def user_to_response(user: User) -> UserResponse:
     return UserResponse(
-        id=str(user.id),
+        id=user.id,
         email=user.email,
         name=user.name,
         role=user.role,
-        tenant_id=str(user.tenant_id),
+        tenant_id=user.tenant_id,
     )
 
 
+def auth_response(user: User) -> ORJSONResponse:
+    """
+    Issue tokens for a user and serialize the AuthResponse directly.
+
+    Returning a Response skips FastAPI's response_model re-validation; the
+    model is still declared on the routes for the OpenAPI schema.
+    """
+    body = AuthResponse(user=user_to_response(user), tokens=create_tokens(str(user.id)))
+    return ORJSONResponse(body.model_dump(mode="json"))
+
+
 @router.post("/login", response_model=AuthResponse)
 async def login(
     request: LoginRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> AuthResponse:
+) -> ORJSONResponse:
     """Login with email and password."""
     user = await authenticate_user(db, request.email, request.password)
     if not user:
@@ -58,21 +73,16 @@ async def login(
             detail="Inactive user",
         )
 
-    tokens = create_tokens(str(user.id))
-    return AuthResponse(
-        user=user_to_response(user),
-        tokens=tokens,
-    )
+    return auth_response(user)
 
 
 @router.post("/register", response_model=AuthResponse)
 async def register(
     request: RegisterRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> AuthResponse:
+) -> ORJSONResponse:
     """Register a new user."""
-    existing_user = await get_user_by_email(db, request.email)
-    if existing_user:
+    if await email_exists(db, request.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -80,7 +90,7 @@ async def register(
 
     # Create or get tenant
     if request.tenant_name:
-        tenant = await create_tenant(db, request.tenant_name)
+        tenant = await create_tenant(db, request.tenant_name, first_admin_assigned=True)
         role = UserRole.ADMIN  # First user in tenant is admin
     else:
         # For now, require tenant name for registration
@@ -98,59 +108,47 @@ async def register(
         role=role,
     )
 
-    tokens = create_tokens(str(user.id))
-    return AuthResponse(
-        user=user_to_response(user),
-        tokens=tokens,
-    )
+    return auth_response(user)
 
 
 @router.post("/google", response_model=AuthResponse)
 async def google_auth(
     request: GoogleAuthRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> AuthResponse:
+) -> ORJSONResponse:
     """Authenticate with Google OAuth."""
-    google_info = verify_google_token(request.credential)
+    # Signature checks (and an occasional cert refetch) block; keep them off the loop
+    google_info = await run_in_threadpool(verify_google_token, request.credential)
     if not google_info:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Google token",
         )
 
-    # Check if user exists by Google ID
-    user = await get_user_by_google_id(db, google_info["google_id"])
-
-    if not user:
-        # Check if user exists by email
-        user = await get_user_by_email(db, google_info["email"])
+    # Look up by Google ID, falling back to email, in one round trip
+    user = await get_user_for_google_login(db, google_info["google_id"], google_info["email"])
 
-        if user:
+    if user:
+        if user.google_id != google_info["google_id"]:
             # Link Google ID to existing user
             user.google_id = google_info["google_id"]
             await db.commit()
-            await db.refresh(user)
-        else:
-            # Create new user and tenant based on email domain
-            tenant = await get_or_create_tenant_for_google_user(db, google_info["email"])
-
-            # Check if this is the first user in the tenant
-            from sqlmodel import select, func
-
-            result = await db.execute(
-                select(func.count(User.id)).where(User.tenant_id == tenant.id)
-            )
-            user_count = result.scalar_one()
-            role = UserRole.ADMIN if user_count == 0 else UserRole.OPERATOR
-
-            user = await create_user(
-                db,
-                email=google_info["email"],
-                name=google_info["name"],
-                google_id=google_info["google_id"],
-                tenant_id=tenant.id,
-                role=role,
-            )
+    else:
+        # Create new user and tenant based on email domain
+        tenant = await get_or_create_tenant_for_google_user(db, google_info["email"])
+
+        # First user in the tenant becomes admin
+        is_first_user = await claim_first_admin(db, tenant.id)
+        role = UserRole.ADMIN if is_first_user else UserRole.OPERATOR
+
+        user = await create_user(
+            db,
+            email=google_info["email"],
+            name=google_info["name"],
+            google_id=google_info["google_id"],
+            tenant_id=tenant.id,
+            role=role,
+        )
 
     if not user.is_active:
         raise HTTPException(
@@ -158,18 +156,14 @@ async def google_auth(
             detail="Inactive user",
         )
 
-    tokens = create_tokens(str(user.id))
-    return AuthResponse(
-        user=user_to_response(user),
-        tokens=tokens,
-    )
+    return auth_response(user)
 
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     request: RefreshTokenRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> Token:
+) -> ORJSONResponse:
     """Refresh access token using refresh token."""
     payload = decode_token(request.refresh_token)
 
@@ -179,10 +173,7 @@ async def refresh_token(
             detail="Invalid refresh token",
         )
 
-    from sqlmodel import select
-
-    result = await db.execute(select(User).where(User.id == payload.sub))
-    user = result.scalar_one_or_none()
+    user = await get_user_by_id(db, payload.sub)
 
     if not user or not user.is_active:
         raise HTTPException(
@@ -190,7 +181,7 @@ async def refresh_token(
             detail="User not found or inactive",
         )
 
-    return create_tokens(str(user.id))
+    return ORJSONResponse(create_tokens(str(user.id)).model_dump(mode="json"))
 
 
 @router.post("/logout")
@@ -201,7 +192,21 @@ async def logout() -> dict[str, str]:
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> UserResponse:
-    """Get current user info."""
-    return user_to_response(current_user)
+) -> Response:
+    """
+    Get current user info.
+
+    Polled by the frontend on navigation, so it carries a weak ETag derived
+    from updated_at and answers matching If-None-Match with 304.
+    """
+    etag = f'W/"{current_user.id}-{current_user.updated_at.isoformat()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=30"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return ORJSONResponse(
+        user_to_response(current_user).model_dump(mode="json"),
+        headers=headers,
+    )
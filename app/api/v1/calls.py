@@ -1,16 +1,32 @@
+import asyncio
+import codecs
 import csv
+import gzip
 import io
 import uuid
-from datetime import datetime
-from typing import Annotated
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Annotated, BinaryIO
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, exists, insert, lambda_stmt, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, tuple_
 
 from app.api.deps import CurrentUser, get_db
+from app.api.pagination import decode_cursor, encode_cursor
+from app.models.analysis_result import AnalysisResult
 from app.models.call_record import AnalysisStatus, CallRecord
 from app.models.operator import Operator
+from app.schemas.call import (
+    AnalysisDetail,
+    CallAnalysisResponse,
+    CallDetailResponse,
+    CallListResponse,
+    call_list_items,
+)
 from app.schemas.upload import (
     AudioUploadResponse,
     BulkUploadResponse,
@@ -31,31 +47,151 @@ ALLOWED_AUDIO_TYPES = {
     "audio/x-m4a": [".m4a"],
 }
 
+ALLOWED_AUDIO_CONTENT_TYPES = frozenset(ALLOWED_AUDIO_TYPES)
+INVALID_AUDIO_TYPE_DETAIL = f"Invalid file type. Allowed types: {list(ALLOWED_AUDIO_TYPES)}"
+
 MAX_AUDIO_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 
+# Columns returned by list_calls
+LIST_CALL_COLUMNS = (
+    CallRecord.id,
+    CallRecord.event_datetime,
+    CallRecord.operator_id,
+    CallRecord.caller_number,
+    CallRecord.callee_number,
+    CallRecord.talk_time_seconds,
+    CallRecord.analysis_status,
+    CallRecord.inquiry_category,
+)
+
+# Parallel GCS uploads per bulk request; throughput flattens out beyond ~8 streams
+BULK_UPLOAD_CONCURRENCY = 8
+
+# Encodings accepted for CSV metadata uploads, in order of preference
+CSV_ENCODINGS = ("utf-8", "shift_jis")
+CSV_READ_CHUNK_SIZE = 64 * 1024
+# Optional free-text CSV columns copied verbatim onto the call record
+CSV_TEXT_COLUMNS = (
+    "caller_number",
+    "callee_number",
+    "call_center_name",
+    "call_center_extension",
+    "business_label",
+)
+# Upload responses report only the first few errors; the rest are only counted
+MAX_REPORTED_ERRORS = 10
+# Rows per executemany INSERT when importing CSV metadata
+CSV_INSERT_BATCH_SIZE = 1000
+
+# Tenant-scoped lookups, built once so each request only binds parameters
+_stmt_call_by_id = lambda_stmt(
+    lambda: select(CallRecord).where(
+        CallRecord.id == bindparam("call_id"),
+        CallRecord.tenant_id == bindparam("tenant_id"),
+    )
+)
+_stmt_call_exists = lambda_stmt(
+    lambda: select(
+        exists().where(
+            CallRecord.id == bindparam("call_id"),
+            CallRecord.tenant_id == bindparam("tenant_id"),
+        )
+    )
+)
+_stmt_audio_path_exists = lambda_stmt(
+    lambda: select(
+        exists().where(
+            CallRecord.audio_file_path == bindparam("blob_path"),
+            CallRecord.tenant_id == bindparam("tenant_id"),
+        )
+    )
+)
+_stmt_call_analysis = lambda_stmt(
+    lambda: select(CallRecord.analysis_status, AnalysisResult)
+    .outerjoin(AnalysisResult, AnalysisResult.call_record_id == CallRecord.id)
+    .where(
+        CallRecord.id == bindparam("call_id"),
+        CallRecord.tenant_id == bindparam("tenant_id"),
+    )
+)
+
 
 def validate_audio_file(file: UploadFile) -> None:
     """Validate uploaded audio file."""
-    if file.content_type not in ALLOWED_AUDIO_TYPES:
+    if file.content_type not in ALLOWED_AUDIO_CONTENT_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Allowed types: {list(ALLOWED_AUDIO_TYPES.keys())}",
+            detail=INVALID_AUDIO_TYPE_DETAIL,
         )
 
 
-@router.get("")
+def upload_size(file: UploadFile) -> int:
+    """Size of an upload in bytes, without reading it into memory."""
+    if file.size is not None:
+        return file.size
+    size = file.file.seek(0, io.SEEK_END)
+    file.file.seek(0)
+    return size
+
+
+def _csv_column(header: list[str], name: str) -> Callable[[list[str]], str]:
+    """Build a getter returning the stripped value of a named CSV column ("" if absent)."""
+    if name not in header:
+        return lambda row: ""
+    index = header.index(name)
+    return lambda row: row[index].strip() if index < len(row) else ""
+
+
+def _parse_optional_int(value: str) -> int | None:
+    """Parse an optional integer CSV cell, ignoring malformed values."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _detect_csv_encoding(stream: BinaryIO) -> str | None:
+    """
+    Find the first CSV_ENCODINGS entry that decodes the whole stream.
+
+    Decodes incrementally in chunks so memory stays bounded, and rewinds the
+    stream before returning.
+    """
+    for encoding in CSV_ENCODINGS:
+        stream.seek(0)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            while chunk := stream.read(CSV_READ_CHUNK_SIZE):
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        stream.seek(0)
+        return encoding
+    return None
+
+
+@router.get("", response_model=CallListResponse)
 async def list_calls(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    skip: int = Query(0, ge=0),
+    cursor: str | None = None,
     limit: int = Query(50, ge=1, le=100),
     operator_id: uuid.UUID | None = None,
     status_filter: AnalysisStatus | None = None,
     date_from: datetime | None = None,
     date_to: datetime | None = None,
-):
-    """List call records with filtering and pagination."""
-    query = select(CallRecord).where(CallRecord.tenant_id == current_user.tenant_id)
+) -> ORJSONResponse:
+    """
+    List call records with filtering and keyset pagination.
+
+    Pass the returned next_cursor to fetch the following page; it is null on
+    the last page. Pages are ordered by (event_datetime, id) descending.
+    """
+    # Project only the listed columns instead of materializing CallRecord objects
+    query = select(*LIST_CALL_COLUMNS).where(CallRecord.tenant_id == current_user.tenant_id)
 
     if operator_id:
         query = query.where(CallRecord.operator_id == operator_id)
@@ -65,32 +201,30 @@ async def list_calls(
         query = query.where(CallRecord.event_datetime >= date_from)
     if date_to:
         query = query.where(CallRecord.event_datetime <= date_to)
+    if cursor:
+        query = query.where(
+            tuple_(CallRecord.event_datetime, CallRecord.id) < tuple_(*decode_cursor(cursor))
+        )
 
-    query = query.order_by(CallRecord.event_datetime.desc()).offset(skip).limit(limit)
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(CallRecord.event_datetime.desc(), CallRecord.id.desc()).limit(limit + 1)
 
     result = await db.execute(query)
-    calls = result.scalars().all()
-
-    return {
-        "items": [
-            {
-                "id": str(call.id),
-                "event_datetime": call.event_datetime.isoformat(),
-                "operator_id": str(call.operator_id) if call.operator_id else None,
-                "caller_number": call.caller_number,
-                "callee_number": call.callee_number,
-                "talk_time_seconds": call.talk_time_seconds,
-                "analysis_status": call.analysis_status,
-                "inquiry_category": call.inquiry_category,
-            }
-            for call in calls
-        ],
-        "skip": skip,
-        "limit": limit,
-    }
+    calls = result.all()
+    has_more = len(calls) > limit
+    calls = calls[:limit]
+
+    body = CallListResponse(
+        items=call_list_items.validate_python(calls, from_attributes=True),
+        next_cursor=(
+            encode_cursor(calls[-1].event_datetime, calls[-1].id) if has_more else None
+        ),
+        limit=limit,
+    )
+    return ORJSONResponse(body.model_dump(mode="json"))
 
 
-@router.get("/{call_id}")
+@router.get("/{call_id}", response_model=CallDetailResponse)
 async def get_call(
     call_id: uuid.UUID,
     current_user: CurrentUser,
@@ -98,10 +232,7 @@ async def get_call(
 ):
     """Get a specific call record."""
     result = await db.execute(
-        select(CallRecord).where(
-            CallRecord.id == call_id,
-            CallRecord.tenant_id == current_user.tenant_id,
-        )
+        _stmt_call_by_id, {"call_id": call_id, "tenant_id": current_user.tenant_id}
     )
     call = result.scalar_one_or_none()
 
@@ -111,33 +242,14 @@ async def get_call(
             detail="Call record not found",
         )
 
+    response = CallDetailResponse.model_validate(call)
+
     # Generate signed URL if audio file exists
-    signed_url = None
     if call.audio_file_path:
         storage = get_storage_service()
-        signed_url = storage.generate_signed_url(call.audio_file_path)
+        response.audio_signed_url = storage.generate_signed_url(call.audio_file_path)
 
-    return {
-        "id": str(call.id),
-        "biztel_id": call.biztel_id,
-        "request_id": call.request_id,
-        "event_datetime": call.event_datetime.isoformat(),
-        "call_center_name": call.call_center_name,
-        "call_center_extension": call.call_center_extension,
-        "business_label": call.business_label,
-        "operator_id": str(call.operator_id) if call.operator_id else None,
-        "operation_flow_id": str(call.operation_flow_id) if call.operation_flow_id else None,
-        "inquiry_category": call.inquiry_category,
-        "event_type": call.event_type,
-        "caller_number": call.caller_number,
-        "callee_number": call.callee_number,
-        "wait_time_seconds": call.wait_time_seconds,
-        "talk_time_seconds": call.talk_time_seconds,
-        "audio_file_path": call.audio_file_path,
-        "audio_signed_url": signed_url,
-        "analysis_status": call.analysis_status,
-        "created_at": call.created_at.isoformat(),
-    }
+    return response
 
 
 @router.post("/upload/audio", response_model=AudioUploadResponse)
@@ -158,9 +270,7 @@ async def upload_audio(
     """
     validate_audio_file(file)
 
-    # Read file content
-    content = await file.read()
-    if len(content) > MAX_AUDIO_FILE_SIZE:
+    if upload_size(file) > MAX_AUDIO_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size is {MAX_AUDIO_FILE_SIZE // (1024*1024)}MB",
@@ -182,29 +292,32 @@ async def upload_audio(
     # Upload to GCS
     storage = get_storage_service()
     upload_result = await storage.upload_audio_file(
-        file_content=content,
+        file_obj=file.file,
         filename=file.filename or "audio.mp3",
         tenant_id=str(current_user.tenant_id),
         content_type=file.content_type or "audio/mpeg",
     )
 
-    # Create call record
-    call_record = CallRecord(
-        tenant_id=current_user.tenant_id,
-        event_datetime=event_datetime,
-        operator_id=operator_id,
-        caller_number=caller_number,
-        callee_number=callee_number,
-        talk_time_seconds=talk_time_seconds,
-        audio_file_path=upload_result["blob_path"],
-        analysis_status=AnalysisStatus.PENDING,
+    # Create call record; RETURNING saves a refresh round trip
+    result = await db.execute(
+        insert(CallRecord)
+        .values(
+            tenant_id=current_user.tenant_id,
+            event_datetime=event_datetime,
+            operator_id=operator_id,
+            caller_number=caller_number,
+            callee_number=callee_number,
+            talk_time_seconds=talk_time_seconds,
+            audio_file_path=upload_result["blob_path"],
+            analysis_status=AnalysisStatus.PENDING,
+        )
+        .returning(CallRecord.id)
     )
-    db.add(call_record)
+    call_record_id = result.scalar_one()
     await db.commit()
-    await db.refresh(call_record)
 
     return AudioUploadResponse(
-        call_record_id=str(call_record.id),
+        call_record_id=call_record_id,
         blob_path=upload_result["blob_path"],
         signed_url=upload_result["signed_url"],
         expires_at=upload_result["expires_at"],
@@ -216,7 +329,7 @@ async def upload_csv_metadata(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
     file: UploadFile = File(...),
-):
+) -> ORJSONResponse:
     """
     Upload CSV file with call metadata.
 
@@ -229,108 +342,125 @@ async def upload_csv_metadata(
     - business_label: Business label
     - wait_time_seconds: Wait time in seconds
     - talk_time_seconds: Talk time in seconds
+
+    Gzip-compressed uploads (.csv.gz or Content-Encoding: gzip) are
+    decompressed on the fly.
     """
-    if not file.filename or not file.filename.endswith(".csv"):
+    if not file.filename or not file.filename.endswith((".csv", ".csv.gz")):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File must be a CSV file",
         )
 
-    content = await file.read()
+    stream: BinaryIO = file.file
+    if file.filename.endswith(".gz") or file.headers.get("content-encoding") == "gzip":
+        stream = gzip.GzipFile(fileobj=file.file, mode="rb")
+
+    # Parse straight from the spooled upload instead of decoding it into memory
     try:
-        text_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            text_content = content.decode("shift_jis")
-        except UnicodeDecodeError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unable to decode CSV file. Please use UTF-8 or Shift-JIS encoding.",
+        encoding = await run_in_threadpool(_detect_csv_encoding, stream)
+    except (OSError, EOFError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unable to decompress gzip CSV file.",
+        )
+    if encoding is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unable to decode CSV file. Please use UTF-8 or Shift-JIS encoding.",
+        )
+
+    text_stream = io.TextIOWrapper(stream, encoding=encoding, newline="")
+
+    # Rows are read as lists with column getters bound once from the header,
+    # avoiding a dict per row and a dict lookup per field
+    reader = csv.reader(text_stream)
+    header = next(reader, [])
+    get_operator_name = _csv_column(header, "operator_name")
+
+    # First pass: resolve every referenced operator with a single IN query
+    operator_names = {name for row in reader if row and (name := get_operator_name(row))}
+    operator_cache: dict[str, uuid.UUID] = {}
+    if operator_names:
+        result = await db.execute(
+            select(Operator.name, Operator.id).where(
+                Operator.tenant_id == current_user.tenant_id,
+                Operator.name.in_(operator_names),
             )
+        )
+        operator_cache = dict(result.all())
+
+    text_stream.seek(0)
+    reader = csv.reader(text_stream)
+    next(reader, None)  # header
 
-    reader = csv.DictReader(io.StringIO(text_content))
+    get_event_datetime = _csv_column(header, "event_datetime")
+    get_wait_time = _csv_column(header, "wait_time_seconds")
+    get_talk_time = _csv_column(header, "talk_time_seconds")
+    text_columns = [(name, _csv_column(header, name)) for name in CSV_TEXT_COLUMNS]
 
     created_count = 0
     skipped_count = 0
     errors = []
+    records: list[dict] = []
 
-    # Cache operators by name
-    operator_cache: dict[str, uuid.UUID | None] = {}
-
-    for row_num, row in enumerate(reader, start=2):  # Start from 2 (header is row 1)
+    rows = (row for row in reader if row)  # csv.DictReader also skipped blank lines
+    for row_num, row in enumerate(rows, start=2):  # Start from 2 (header is row 1)
         try:
             # Parse event_datetime
-            event_datetime_str = row.get("event_datetime", "").strip()
+            event_datetime_str = get_event_datetime(row)
             if not event_datetime_str:
-                errors.append(f"Row {row_num}: event_datetime is required")
                 skipped_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(f"Row {row_num}: event_datetime is required")
                 continue
 
             try:
                 event_datetime = datetime.fromisoformat(event_datetime_str)
             except ValueError:
-                errors.append(f"Row {row_num}: Invalid datetime format")
                 skipped_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(f"Row {row_num}: Invalid datetime format")
                 continue
 
-            # Find operator
-            operator_id = None
-            operator_name = row.get("operator_name", "").strip()
-            if operator_name:
-                if operator_name not in operator_cache:
-                    result = await db.execute(
-                        select(Operator).where(
-                            Operator.tenant_id == current_user.tenant_id,
-                            Operator.name == operator_name,
-                        )
-                    )
-                    operator = result.scalar_one_or_none()
-                    operator_cache[operator_name] = operator.id if operator else None
-                operator_id = operator_cache[operator_name]
-
-            # Parse optional integers
-            wait_time = None
-            talk_time = None
-            if row.get("wait_time_seconds"):
-                try:
-                    wait_time = int(row["wait_time_seconds"])
-                except ValueError:
-                    pass
-            if row.get("talk_time_seconds"):
-                try:
-                    talk_time = int(row["talk_time_seconds"])
-                except ValueError:
-                    pass
-
-            # Create call record
-            call_record = CallRecord(
-                tenant_id=current_user.tenant_id,
-                event_datetime=event_datetime,
-                operator_id=operator_id,
-                caller_number=row.get("caller_number", "").strip() or None,
-                callee_number=row.get("callee_number", "").strip() or None,
-                call_center_name=row.get("call_center_name", "").strip() or None,
-                call_center_extension=row.get("call_center_extension", "").strip() or None,
-                business_label=row.get("business_label", "").strip() or None,
-                wait_time_seconds=wait_time,
-                talk_time_seconds=talk_time,
-                analysis_status=AnalysisStatus.PENDING,
-            )
-            db.add(call_record)
+            record = {
+                "tenant_id": current_user.tenant_id,
+                "event_datetime": event_datetime,
+                "operator_id": operator_cache.get(get_operator_name(row)),
+                "wait_time_seconds": _parse_optional_int(get_wait_time(row)),
+                "talk_time_seconds": _parse_optional_int(get_talk_time(row)),
+                "analysis_status": AnalysisStatus.PENDING,
+            }
+            for name, get_value in text_columns:
+                record[name] = get_value(row) or None
+            records.append(record)
             created_count += 1
 
         except Exception as e:
-            errors.append(f"Row {row_num}: {str(e)}")
             skipped_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"Row {row_num}: {str(e)}")
+            continue
+
+        # Bulk insert in bounded batches instead of per-row ORM adds
+        if len(records) >= CSV_INSERT_BATCH_SIZE:
+            await db.execute(insert(CallRecord), records)
+            records = []
+
+    if records:
+        await db.execute(insert(CallRecord), records)
 
+    # Leave the underlying upload file for FastAPI to close
+    text_stream.detach()
     await db.commit()
 
-    return CSVUploadResponse(
+    body = CSVUploadResponse(
         total_rows=created_count + skipped_count,
         created_count=created_count,
         skipped_count=skipped_count,
-        errors=errors[:10],  # Limit errors returned
+        errors=errors,
     )
+    return ORJSONResponse(body.model_dump(mode="json"))
 
 
 @router.post("/upload/bulk", response_model=BulkUploadResponse)
@@ -338,59 +468,74 @@ async def upload_bulk(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
     files: list[UploadFile] = File(...),
-):
+) -> ORJSONResponse:
     """
     Upload multiple audio files at once.
 
-    Each file creates a new CallRecord with the current datetime.
+    Each file creates a new CallRecord stamped with the request's ingestion time.
     """
     uploaded_files = 0
     created_records = 0
     errors = []
 
+    # One ingestion time for the whole batch; event_datetime is stored as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     storage = get_storage_service()
-
-    for file in files:
-        try:
-            # Validate file type
-            if file.content_type not in ALLOWED_AUDIO_TYPES:
-                errors.append(f"{file.filename}: Invalid file type")
-                continue
-
-            content = await file.read()
-            if len(content) > MAX_AUDIO_FILE_SIZE:
-                errors.append(f"{file.filename}: File too large")
-                continue
-
-            # Upload to GCS
-            upload_result = await storage.upload_audio_file(
-                file_content=content,
+    semaphore = asyncio.Semaphore(BULK_UPLOAD_CONCURRENCY)
+
+    async def upload_one(file: UploadFile) -> dict:
+        # Validate file type
+        if file.content_type not in ALLOWED_AUDIO_CONTENT_TYPES:
+            raise ValueError("Invalid file type")
+        if upload_size(file) > MAX_AUDIO_FILE_SIZE:
+            raise ValueError("File too large")
+
+        async with semaphore:
+            return await storage.upload_audio_file(
+                file_obj=file.file,
                 filename=file.filename or "audio.mp3",
                 tenant_id=str(current_user.tenant_id),
                 content_type=file.content_type or "audio/mpeg",
             )
-            uploaded_files += 1
-
-            # Create call record
-            call_record = CallRecord(
-                tenant_id=current_user.tenant_id,
-                event_datetime=datetime.utcnow(),
-                audio_file_path=upload_result["blob_path"],
-                analysis_status=AnalysisStatus.PENDING,
-            )
-            db.add(call_record)
-            created_records += 1
-
-        except Exception as e:
-            errors.append(f"{file.filename}: {str(e)}")
 
-    await db.commit()
+    # Upload concurrently; the session is only touched afterwards, sequentially
+    results = await asyncio.gather(*(upload_one(file) for file in files), return_exceptions=True)
+
+    records = []
+    for file, upload_result in zip(files, results):
+        if isinstance(upload_result, Exception):
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"{file.filename}: {str(upload_result)}")
+            continue
+        uploaded_files += 1
+        records.append(
+            {
+                "tenant_id": current_user.tenant_id,
+                "event_datetime": now,
+                "audio_file_path": upload_result["blob_path"],
+                "analysis_status": AnalysisStatus.PENDING,
+            }
+        )
 
-    return BulkUploadResponse(
+    if records:
+        # One multi-row INSERT for the batch; drop the uploaded blobs if it fails
+        try:
+            result = await db.execute(
+                insert(CallRecord).values(records).returning(CallRecord.id)
+            )
+            created_records = len(result.all())
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            await storage.delete_files([record["audio_file_path"] for record in records])
+            raise
+
+    body = BulkUploadResponse(
         uploaded_files=uploaded_files,
         created_records=created_records,
         errors=errors,
     )
+    return ORJSONResponse(body.model_dump(mode="json"))
 
 
 @router.post("/signed-url", response_model=SignedUrlResponse)
@@ -401,24 +546,23 @@ async def get_signed_url(
 ):
     """Generate a signed URL for accessing an audio file."""
     # Verify the file belongs to user's tenant
-    result = await db.execute(
-        select(CallRecord).where(
-            CallRecord.audio_file_path == request.blob_path,
-            CallRecord.tenant_id == current_user.tenant_id,
-        )
+    file_exists = await db.scalar(
+        _stmt_audio_path_exists,
+        {"blob_path": request.blob_path, "tenant_id": current_user.tenant_id},
     )
-    call = result.scalar_one_or_none()
 
-    if not call:
+    if not file_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found or access denied",
         )
 
     storage = get_storage_service()
+    # Not served from the cache: the response reports the full expiration window
     signed_url = storage.generate_signed_url(
         request.blob_path,
         expiration_minutes=request.expiration_minutes,
+        cached=False,
     )
 
     return SignedUrlResponse(
@@ -427,57 +571,32 @@ async def get_signed_url(
     )
 
 
-@router.get("/{call_id}/analysis")
+@router.get("/{call_id}/analysis", response_model=CallAnalysisResponse)
 async def get_call_analysis(
     call_id: uuid.UUID,
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get analysis result for a call record."""
-    from app.models.analysis_result import AnalysisResult
-
+    # Tenant check and analysis lookup in one round trip
     result = await db.execute(
-        select(CallRecord).where(
-            CallRecord.id == call_id,
-            CallRecord.tenant_id == current_user.tenant_id,
-        )
+        _stmt_call_analysis, {"call_id": call_id, "tenant_id": current_user.tenant_id}
     )
-    call = result.scalar_one_or_none()
+    row = result.first()
 
-    if not call:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Call record not found",
         )
 
-    # Get analysis result
-    result = await db.execute(
-        select(AnalysisResult).where(AnalysisResult.call_record_id == call_id)
-    )
-    analysis = result.scalar_one_or_none()
-
-    if not analysis:
-        return {
-            "call_id": str(call_id),
-            "status": call.analysis_status,
-            "analysis": None,
-        }
+    analysis_status, analysis = row
 
-    return {
-        "call_id": str(call_id),
-        "status": call.analysis_status,
-        "analysis": {
-            "id": str(analysis.id),
-            "transcript": analysis.transcript,
-            "flow_compliance": analysis.flow_compliance,
-            "compliance_details": analysis.compliance_details,
-            "overall_score": analysis.overall_score,
-            "fillers_count": analysis.fillers_count,
-            "silence_duration": analysis.silence_duration,
-            "summary": analysis.summary,
-            "created_at": analysis.created_at.isoformat(),
-        },
-    }
+    return CallAnalysisResponse(
+        call_id=call_id,
+        status=analysis_status,
+        analysis=AnalysisDetail.model_validate(analysis) if analysis else None,
+    )
 
 
 @router.post("/{call_id}/reanalyze")
@@ -487,28 +606,35 @@ async def reanalyze_call(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Trigger re-analysis for a call record."""
+    # Reset status to pending in a single conditional UPDATE
     result = await db.execute(
-        select(CallRecord).where(
+        update(CallRecord)
+        .where(
             CallRecord.id == call_id,
             CallRecord.tenant_id == current_user.tenant_id,
+            CallRecord.audio_file_path.is_not(None),
         )
+        .values(analysis_status=AnalysisStatus.PENDING)
+        .returning(CallRecord.analysis_status)
+        .execution_options(synchronize_session=False)
     )
-    call = result.scalar_one_or_none()
+    analysis_status = result.scalar_one_or_none()
 
-    if not call:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Call record not found",
+    if analysis_status is None:
+        # Only the error path pays for a second query to pick the right status
+        call_exists = await db.scalar(
+            _stmt_call_exists, {"call_id": call_id, "tenant_id": current_user.tenant_id}
         )
-
-    if not call.audio_file_path:
+        if not call_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Call record not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No audio file associated with this call",
         )
 
-    # Reset status to pending
-    call.analysis_status = AnalysisStatus.PENDING
     await db.commit()
 
     # TODO: Trigger Celery task for re-analysis
@@ -516,5 +642,5 @@ async def reanalyze_call(
     return {
         "message": "Re-analysis queued",
         "call_id": str(call_id),
-        "status": call.analysis_status,
+        "status": analysis_status,
     }
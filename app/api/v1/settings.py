@@ -1,15 +1,20 @@
+import asyncio
+import hashlib
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, insert, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.api.deps import AdminUser, QAUser, get_db
-from app.models.call_record import AnalysisStatus, CallRecord
+from app.api.deps import AdminUser, CurrentTenant, QAUser, get_db, invalidate_cached_tenant
+from app.config import settings
+from app.models.analysis_prompt import AnalysisPrompt, PromptType
 from app.models.operation_flow import OperationFlow
-from app.models.operator import Operator
 from app.models.tenant import Tenant
 from app.schemas.biztel import (
     BiztelConnectionTestResponse,
@@ -25,10 +30,81 @@ from app.services.biztel import (
     BiztelCredentials,
     BiztelEventType,
 )
+from app.services.biztel_sync import BiztelSyncStats, sync_biztel_history
+from app.services.cache import get_response_cache
+from app.services.llm import get_llm_service
 from app.services.storage import get_storage_service
 
 router = APIRouter()
 
+# Response cache namespaces; each is invalidated per tenant on any write
+FLOWS_CACHE_NAMESPACE = "flows"
+PROMPTS_CACHE_NAMESPACE = "prompts"
+
+# Columns rendered by the read endpoints; selected as plain rows, no ORM hydration
+FLOW_LIST_COLUMNS = (
+    OperationFlow.id,
+    OperationFlow.name,
+    OperationFlow.classification_criteria,
+    OperationFlow.flow_definition,
+    OperationFlow.is_active,
+    OperationFlow.created_at,
+    OperationFlow.updated_at,
+)
+PROMPT_LIST_COLUMNS = (
+    AnalysisPrompt.id,
+    AnalysisPrompt.prompt_type,
+    AnalysisPrompt.name,
+    AnalysisPrompt.description,
+    AnalysisPrompt.prompt_text,
+    AnalysisPrompt.is_active,
+    AnalysisPrompt.is_default,
+    AnalysisPrompt.created_at,
+    AnalysisPrompt.updated_at,
+)
+
+# Tenant-scoped lookups, built once so each request only binds parameters
+_stmt_flow_by_id = lambda_stmt(
+    lambda: select(OperationFlow).where(
+        OperationFlow.id == bindparam("flow_id"),
+        OperationFlow.tenant_id == bindparam("tenant_id"),
+    )
+)
+_stmt_prompt_by_id = lambda_stmt(
+    lambda: select(AnalysisPrompt).where(
+        AnalysisPrompt.id == bindparam("prompt_id"),
+        AnalysisPrompt.tenant_id == bindparam("tenant_id"),
+    )
+)
+# Read-only variants for the detail endpoints; rows, not hydrated instances
+_stmt_flow_row_by_id = lambda_stmt(
+    lambda: select(*FLOW_LIST_COLUMNS).where(
+        OperationFlow.id == bindparam("flow_id"),
+        OperationFlow.tenant_id == bindparam("tenant_id"),
+    )
+)
+_stmt_prompt_row_by_id = lambda_stmt(
+    lambda: select(*PROMPT_LIST_COLUMNS).where(
+        AnalysisPrompt.id == bindparam("prompt_id"),
+        AnalysisPrompt.tenant_id == bindparam("tenant_id"),
+    )
+)
+
+
+def _etag_response(request: Request, body: Any) -> Response:
+    """
+    Serialize a settings read once and tag it with a weak content ETag.
+
+    Answers a matching If-None-Match with 304, so polling clients skip the
+    payload; combined with the response cache that needs no DB access.
+    """
+    content = orjson.dumps(body)
+    etag = f'W/"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content, media_type="application/json", headers=headers)
+
 
 # ============================================================
 # Operation Flows
@@ -37,31 +113,25 @@ router = APIRouter()
 
 @router.get("/flows")
 async def list_flows(
+    request: Request,
     current_user: QAUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """List all operation flows for the tenant."""
+    cache = get_response_cache()
+    cached = await cache.get(FLOWS_CACHE_NAMESPACE, current_user.tenant_id, "list")
+    if cached is not None:
+        return _etag_response(request, cached)
+
     result = await db.execute(
-        select(OperationFlow)
+        select(*FLOW_LIST_COLUMNS)
         .where(OperationFlow.tenant_id == current_user.tenant_id)
         .order_by(OperationFlow.name)
     )
-    flows = result.scalars().all()
 
-    return {
-        "items": [
-            {
-                "id": str(flow.id),
-                "name": flow.name,
-                "classification_criteria": flow.classification_criteria,
-                "flow_definition": flow.flow_definition,
-                "is_active": flow.is_active,
-                "created_at": flow.created_at.isoformat(),
-                "updated_at": flow.updated_at.isoformat(),
-            }
-            for flow in flows
-        ]
-    }
+    response = {"items": [row._asdict() for row in result]}
+    await cache.set(FLOWS_CACHE_NAMESPACE, current_user.tenant_id, "list", response)
+    return _etag_response(request, response)
 
 
 @router.post("/flows")
@@ -73,57 +143,59 @@ async def create_flow(
     flow_definition: dict[str, Any] | None = None,
 ):
     """Create a new operation flow."""
-    flow = OperationFlow(
-        tenant_id=current_user.tenant_id,
-        name=name,
-        classification_criteria=classification_criteria,
-        flow_definition=flow_definition or {},
-        is_active=True,
+    flow_definition = flow_definition or {}
+    result = await db.execute(
+        insert(OperationFlow)
+        .values(
+            tenant_id=current_user.tenant_id,
+            name=name,
+            classification_criteria=classification_criteria,
+            flow_definition=flow_definition,
+            is_active=True,
+        )
+        .returning(OperationFlow.id, OperationFlow.created_at)
     )
-    db.add(flow)
+    flow_id, created_at = result.one()
     await db.commit()
-    await db.refresh(flow)
+    await get_response_cache().invalidate(FLOWS_CACHE_NAMESPACE, current_user.tenant_id)
 
     return {
-        "id": str(flow.id),
-        "name": flow.name,
-        "classification_criteria": flow.classification_criteria,
-        "flow_definition": flow.flow_definition,
-        "is_active": flow.is_active,
-        "created_at": flow.created_at.isoformat(),
+        "id": flow_id,
+        "name": name,
+        "classification_criteria": classification_criteria,
+        "flow_definition": flow_definition,
+        "is_active": True,
+        "created_at": created_at,
     }
 
 
 @router.get("/flows/{flow_id}")
 async def get_flow(
+    request: Request,
     flow_id: uuid.UUID,
     current_user: QAUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get a specific operation flow."""
+    cache = get_response_cache()
+    cached = await cache.get(FLOWS_CACHE_NAMESPACE, current_user.tenant_id, str(flow_id))
+    if cached is not None:
+        return _etag_response(request, cached)
+
     result = await db.execute(
-        select(OperationFlow).where(
-            OperationFlow.id == flow_id,
-            OperationFlow.tenant_id == current_user.tenant_id,
-        )
+        _stmt_flow_row_by_id, {"flow_id": flow_id, "tenant_id": current_user.tenant_id}
     )
-    flow = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not flow:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Operation flow not found",
         )
 
-    return {
-        "id": str(flow.id),
-        "name": flow.name,
-        "classification_criteria": flow.classification_criteria,
-        "flow_definition": flow.flow_definition,
-        "is_active": flow.is_active,
-        "created_at": flow.created_at.isoformat(),
-        "updated_at": flow.updated_at.isoformat(),
-    }
+    response = row._asdict()
+    await cache.set(FLOWS_CACHE_NAMESPACE, current_user.tenant_id, str(flow_id), response)
+    return _etag_response(request, response)
 
 
 @router.put("/flows/{flow_id}")
@@ -138,10 +210,7 @@ async def update_flow(
 ):
     """Update an operation flow."""
     result = await db.execute(
-        select(OperationFlow).where(
-            OperationFlow.id == flow_id,
-            OperationFlow.tenant_id == current_user.tenant_id,
-        )
+        _stmt_flow_by_id, {"flow_id": flow_id, "tenant_id": current_user.tenant_id}
     )
     flow = result.scalar_one_or_none()
 
@@ -160,17 +229,16 @@ async def update_flow(
     if is_active is not None:
         flow.is_active = is_active
 
-    flow.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(flow)
+    await get_response_cache().invalidate(FLOWS_CACHE_NAMESPACE, current_user.tenant_id)
 
     return {
-        "id": str(flow.id),
+        "id": flow.id,
         "name": flow.name,
         "classification_criteria": flow.classification_criteria,
         "flow_definition": flow.flow_definition,
         "is_active": flow.is_active,
-        "updated_at": flow.updated_at.isoformat(),
+        "updated_at": flow.updated_at,
     }
 
 
@@ -182,10 +250,7 @@ async def delete_flow(
 ):
     """Delete an operation flow."""
     result = await db.execute(
-        select(OperationFlow).where(
-            OperationFlow.id == flow_id,
-            OperationFlow.tenant_id == current_user.tenant_id,
-        )
+        _stmt_flow_by_id, {"flow_id": flow_id, "tenant_id": current_user.tenant_id}
     )
     flow = result.scalar_one_or_none()
 
@@ -197,6 +262,7 @@ async def delete_flow(
 
     await db.delete(flow)
     await db.commit()
+    await get_response_cache().invalidate(FLOWS_CACHE_NAMESPACE, current_user.tenant_id)
 
     return {"message": "Operation flow deleted"}
 
@@ -208,14 +274,19 @@ async def delete_flow(
 
 @router.get("/prompts")
 async def list_prompts(
+    request: Request,
     current_user: QAUser,
     db: Annotated[AsyncSession, Depends(get_db)],
     prompt_type: str | None = None,
 ):
     """List all analysis prompts for the tenant."""
-    from app.models.analysis_prompt import AnalysisPrompt, PromptType
+    cache = get_response_cache()
+    cache_field = f"list:{prompt_type or ''}"
+    cached = await cache.get(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id, cache_field)
+    if cached is not None:
+        return _etag_response(request, cached)
 
-    query = select(AnalysisPrompt).where(
+    query = select(*PROMPT_LIST_COLUMNS).where(
         AnalysisPrompt.tenant_id == current_user.tenant_id
     )
 
@@ -225,24 +296,10 @@ async def list_prompts(
     query = query.order_by(AnalysisPrompt.prompt_type, AnalysisPrompt.name)
 
     result = await db.execute(query)
-    prompts = result.scalars().all()
 
-    return {
-        "items": [
-            {
-                "id": str(p.id),
-                "prompt_type": p.prompt_type,
-                "name": p.name,
-                "description": p.description,
-                "prompt_text": p.prompt_text,
-                "is_active": p.is_active,
-                "is_default": p.is_default,
-                "created_at": p.created_at.isoformat(),
-                "updated_at": p.updated_at.isoformat(),
-            }
-            for p in prompts
-        ]
-    }
+    response = {"items": [row._asdict() for row in result]}
+    await cache.set(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id, cache_field, response)
+    return _etag_response(request, response)
 
 
 @router.post("/prompts")
@@ -255,8 +312,6 @@ async def create_prompt(
     description: str | None = None,
 ):
     """Create a new analysis prompt."""
-    from app.models.analysis_prompt import AnalysisPrompt, PromptType
-
     prompt = AnalysisPrompt(
         tenant_id=current_user.tenant_id,
         prompt_type=PromptType(prompt_type),
@@ -268,53 +323,46 @@ async def create_prompt(
     )
     db.add(prompt)
     await db.commit()
-    await db.refresh(prompt)
+    await get_response_cache().invalidate(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id)
 
     return {
-        "id": str(prompt.id),
+        "id": prompt.id,
         "prompt_type": prompt.prompt_type,
         "name": prompt.name,
         "description": prompt.description,
         "prompt_text": prompt.prompt_text,
         "is_active": prompt.is_active,
-        "created_at": prompt.created_at.isoformat(),
+        "created_at": prompt.created_at,
     }
 
 
 @router.get("/prompts/{prompt_id}")
 async def get_prompt(
+    request: Request,
     prompt_id: uuid.UUID,
     current_user: QAUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get a specific analysis prompt."""
-    from app.models.analysis_prompt import AnalysisPrompt
+    cache = get_response_cache()
+    cached = await cache.get(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id, str(prompt_id))
+    if cached is not None:
+        return _etag_response(request, cached)
 
     result = await db.execute(
-        select(AnalysisPrompt).where(
-            AnalysisPrompt.id == prompt_id,
-            AnalysisPrompt.tenant_id == current_user.tenant_id,
-        )
+        _stmt_prompt_row_by_id, {"prompt_id": prompt_id, "tenant_id": current_user.tenant_id}
     )
-    prompt = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not prompt:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Prompt not found",
         )
 
-    return {
-        "id": str(prompt.id),
-        "prompt_type": prompt.prompt_type,
-        "name": prompt.name,
-        "description": prompt.description,
-        "prompt_text": prompt.prompt_text,
-        "is_active": prompt.is_active,
-        "is_default": prompt.is_default,
-        "created_at": prompt.created_at.isoformat(),
-        "updated_at": prompt.updated_at.isoformat(),
-    }
+    response = row._asdict()
+    await cache.set(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id, str(prompt_id), response)
+    return _etag_response(request, response)
 
 
 @router.put("/prompts/{prompt_id}")
@@ -328,13 +376,8 @@ async def update_prompt(
     is_active: bool | None = None,
 ):
     """Update an analysis prompt."""
-    from app.models.analysis_prompt import AnalysisPrompt
-
     result = await db.execute(
-        select(AnalysisPrompt).where(
-            AnalysisPrompt.id == prompt_id,
-            AnalysisPrompt.tenant_id == current_user.tenant_id,
-        )
+        _stmt_prompt_by_id, {"prompt_id": prompt_id, "tenant_id": current_user.tenant_id}
     )
     prompt = result.scalar_one_or_none()
 
@@ -353,18 +396,17 @@ async def update_prompt(
     if is_active is not None:
         prompt.is_active = is_active
 
-    prompt.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(prompt)
+    await get_response_cache().invalidate(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id)
 
     return {
-        "id": str(prompt.id),
+        "id": prompt.id,
         "prompt_type": prompt.prompt_type,
         "name": prompt.name,
         "description": prompt.description,
         "prompt_text": prompt.prompt_text,
         "is_active": prompt.is_active,
-        "updated_at": prompt.updated_at.isoformat(),
+        "updated_at": prompt.updated_at,
     }
 
 
@@ -375,13 +417,8 @@ async def delete_prompt(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Delete an analysis prompt."""
-    from app.models.analysis_prompt import AnalysisPrompt
-
     result = await db.execute(
-        select(AnalysisPrompt).where(
-            AnalysisPrompt.id == prompt_id,
-            AnalysisPrompt.tenant_id == current_user.tenant_id,
-        )
+        _stmt_prompt_by_id, {"prompt_id": prompt_id, "tenant_id": current_user.tenant_id}
     )
     prompt = result.scalar_one_or_none()
 
@@ -399,6 +436,7 @@ async def delete_prompt(
 
     await db.delete(prompt)
     await db.commit()
+    await get_response_cache().invalidate(PROMPTS_CACHE_NAMESPACE, current_user.tenant_id)
 
     return {"message": "Prompt deleted"}
 
@@ -410,8 +448,6 @@ async def test_prompt(
     sample_transcript: str,
 ):
     """Test a prompt with sample transcript."""
-    from app.services.llm import get_llm_service
-
     try:
         llm_service = get_llm_service()
         result = await llm_service._call_llm(
@@ -435,32 +471,35 @@ async def test_prompt(
 # ============================================================
 
 
+# Fixed-width mask so responses do not reveal the key length
+API_KEY_MASK = "****"
+
+
 def _mask_api_key(api_key: str | None) -> str:
-    """Mask API key, showing only last 4 characters."""
+    """Mask API key, showing only the last 4 characters of longer keys."""
     if not api_key:
         return ""
     if len(api_key) <= 4:
-        return "*" * len(api_key)
-    return "*" * (len(api_key) - 4) + api_key[-4:]
+        return API_KEY_MASK
+    return API_KEY_MASK + api_key[-4:]
+
+
+async def _biztel_client(tenant: Tenant) -> BiztelClient:
+    """Reuse the tenant's cached client and its pooled HTTP connections."""
+    credentials = BiztelCredentials(
+        api_key=tenant.biztel_api_key,
+        api_secret=tenant.biztel_api_secret or "",
+        base_url=tenant.biztel_base_url,
+    )
+    return await BiztelClientFactory.get_client(tenant.id, credentials)
 
 
 @router.get("/biztel", response_model=BiztelSettingsResponse)
 async def get_biztel_settings(
     current_user: AdminUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    tenant: CurrentTenant,
 ):
     """Get Biztel API settings for the tenant."""
-    result = await db.execute(
-        select(Tenant).where(Tenant.id == current_user.tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tenant not found",
-        )
-
     return BiztelSettingsResponse(
         api_key_masked=_mask_api_key(tenant.biztel_api_key),
         base_url=tenant.biztel_base_url or "",
@@ -472,32 +511,21 @@ async def get_biztel_settings(
 async def update_biztel_settings(
     request: BiztelSettingsUpdate,
     current_user: AdminUser,
+    tenant: CurrentTenant,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Update Biztel API settings for the tenant."""
-    result = await db.execute(
-        select(Tenant).where(Tenant.id == current_user.tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tenant not found",
-        )
-
     # TODO: Encrypt api_key and api_secret before storing
     tenant.biztel_api_key = request.api_key
     if request.api_secret:
         tenant.biztel_api_secret = request.api_secret
     tenant.biztel_base_url = request.base_url.rstrip("/")
-    tenant.updated_at = datetime.utcnow()
 
     # Clear cached client to force recreation with new credentials
-    BiztelClientFactory.clear_client(tenant.id)
+    await BiztelClientFactory.clear_client(tenant.id)
 
     await db.commit()
-    await db.refresh(tenant)
+    invalidate_cached_tenant(tenant.id)
 
     return BiztelSettingsResponse(
         api_key_masked=_mask_api_key(tenant.biztel_api_key),
@@ -509,38 +537,28 @@ async def update_biztel_settings(
 @router.post("/biztel/test", response_model=BiztelConnectionTestResponse)
 async def test_biztel_connection(
     current_user: AdminUser,
+    tenant: CurrentTenant,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Test Biztel API connection."""
-    result = await db.execute(
-        select(Tenant).where(Tenant.id == current_user.tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
-
-    if not tenant:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tenant not found",
-        )
-
     if not tenant.biztel_api_key or not tenant.biztel_base_url:
         return BiztelConnectionTestResponse(
             success=False,
             message="Biztel API credentials not configured",
         )
 
+    # Release the pooled connection before waiting on Biztel
+    await db.commit()
+
     try:
-        credentials = BiztelCredentials(
-            api_key=tenant.biztel_api_key,
-            api_secret=tenant.biztel_api_secret or "",
-            base_url=tenant.biztel_base_url,
-        )
-        client = BiztelClient(credentials)
+        client = await _biztel_client(tenant)
 
-        # Try to fetch recent history
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        today = datetime.utcnow()
-        records = await client.get_call_history(yesterday, today, limit=10)
+        # Try to fetch recent history; someone is waiting on the answer, so
+        # give up well before the per-request timeout and its retries
+        today = datetime.now(timezone.utc)
+        yesterday = today - timedelta(days=1)
+        async with asyncio.timeout(settings.BIZTEL_CONNECTION_TEST_TIMEOUT):
+            records = await client.get_call_history(yesterday, today, limit=10)
 
         return BiztelConnectionTestResponse(
             success=True,
@@ -553,6 +571,11 @@ async def test_biztel_connection(
             success=False,
             message="Authentication failed. Please check your API key.",
         )
+    except TimeoutError:
+        return BiztelConnectionTestResponse(
+            success=False,
+            message="Connection timed out",
+        )
     except Exception as e:
         return BiztelConnectionTestResponse(
             success=False,
@@ -564,142 +587,48 @@ async def test_biztel_connection(
 async def sync_biztel_data(
     request: BiztelSyncRequest,
     current_user: AdminUser,
+    tenant: CurrentTenant,
     db: Annotated[AsyncSession, Depends(get_db)],
-):
+) -> ORJSONResponse:
     """
     Sync call history from Biztel API.
 
     Downloads call records and recordings for the specified date range.
+    History is processed and committed in batches as pages arrive, so a
+    late failure keeps the batches already synced.
     """
-    result = await db.execute(
-        select(Tenant).where(Tenant.id == current_user.tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
-
-    if not tenant or not tenant.biztel_api_key or not tenant.biztel_base_url:
+    if not tenant.biztel_api_key or not tenant.biztel_base_url:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Biztel API credentials not configured",
         )
 
-    credentials = BiztelCredentials(
-        api_key=tenant.biztel_api_key,
-        api_secret=tenant.biztel_api_secret or "",
-        base_url=tenant.biztel_base_url,
-    )
-    client = BiztelClient(credentials)
+    client = await _biztel_client(tenant)
     storage = get_storage_service()
 
-    total_records = 0
-    new_records = 0
-    updated_records = 0
-    recordings_downloaded = 0
-    errors: list[str] = []
+    stats = BiztelSyncStats()
 
-    # Cache operators
-    operator_cache: dict[str, uuid.UUID] = {}
+    # Hand the pooled connection back while the Biztel history is fetched;
+    # the DB work below runs in short transactions around the HTTP I/O
+    await db.commit()
 
     try:
-        # Fetch call history with pagination
-        history_records = await client.get_call_history_paginated(
+        pages = client.iter_call_history_pages(
             start_date=request.start_date,
             end_date=request.end_date,
             queue_id=request.queue_id,
             events=[BiztelEventType.COMPLETECALLER, BiztelEventType.COMPLETEAGENT],
         )
-
-        total_records = len(history_records)
-
-        for record in history_records:
-            try:
-                # Check if record already exists
-                existing = await db.execute(
-                    select(CallRecord).where(
-                        CallRecord.tenant_id == tenant.id,
-                        CallRecord.request_id == record.request_id,
-                    )
-                )
-                existing_call = existing.scalar_one_or_none()
-
-                # Find or create operator
-                operator_id = None
-                if record.account_id:
-                    if record.account_id not in operator_cache:
-                        op_result = await db.execute(
-                            select(Operator).where(
-                                Operator.tenant_id == tenant.id,
-                                Operator.biztel_operator_id == record.account_id,
-                            )
-                        )
-                        operator = op_result.scalar_one_or_none()
-
-                        if not operator and record.account_name:
-                            operator = Operator(
-                                tenant_id=tenant.id,
-                                biztel_operator_id=record.account_id,
-                                name=record.account_name,
-                            )
-                            db.add(operator)
-                            await db.flush()
-
-                        if operator:
-                            operator_cache[record.account_id] = operator.id
-
-                    operator_id = operator_cache.get(record.account_id)
-
-                if existing_call:
-                    # Update existing record
-                    existing_call.operator_id = operator_id
-                    existing_call.updated_at = datetime.utcnow()
-                    updated_records += 1
-                    call_record = existing_call
-                else:
-                    # Create new record
-                    call_record = CallRecord(
-                        tenant_id=tenant.id,
-                        request_id=record.request_id,
-                        event_datetime=record.start_time,
-                        caller_number=record.caller_id,
-                        callee_number=record.called_id,
-                        wait_time_seconds=record.hold_time,
-                        talk_time_seconds=record.call_time,
-                        operator_id=operator_id,
-                        call_center_name=record.queue_name,
-                        call_center_extension=record.queue_exten,
-                        business_label=record.business_name,
-                        event_type=record.event,
-                        analysis_status=AnalysisStatus.PENDING,
-                    )
-                    db.add(call_record)
-                    await db.flush()
-                    new_records += 1
-
-                # Download recording if available and not already downloaded
-                if record.has_recording and not call_record.audio_file_path:
-                    try:
-                        audio_content = await client.download_recording(record.request_id)
-                        upload_result = await storage.upload_audio_file(
-                            file_content=audio_content,
-                            filename=f"{record.request_id}.mp3",
-                            tenant_id=str(tenant.id),
-                        )
-                        call_record.audio_file_path = upload_result["blob_path"]
-                        recordings_downloaded += 1
-                    except Exception as e:
-                        errors.append(f"Recording {record.request_id}: {str(e)}")
-
-            except Exception as e:
-                errors.append(f"Record {record.request_id}: {str(e)}")
-
-        await db.commit()
+        await sync_biztel_history(db, client, storage, tenant.id, pages, stats)
 
     except Exception as e:
-        errors.append(f"Sync failed: {str(e)}")
-
-    return BiztelSyncResponse(
-        total_records=total_records,
-        new_records=new_records,
-        updated_records=updated_records,
-        recordings_downloaded=recordings_downloaded,
-        errors=errors[:20],  # Limit errors returned
+        stats.errors.append(f"Sync failed: {str(e)}")
+
+    body = BiztelSyncResponse(
+        total_records=stats.total_records,
+        new_records=stats.new_records,
+        updated_records=stats.updated_records,
+        recordings_downloaded=stats.recordings_downloaded,
+        errors=stats.errors[:20],  # Limit errors returned
     )
+    return ORJSONResponse(body.model_dump(mode="json"))
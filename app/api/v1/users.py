@@ -1,15 +1,19 @@
 import uuid
-from datetime import datetime
-from typing import Annotated
+from typing import Annotated, NoReturn
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import ColumnElement, delete, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import func, select
+from sqlmodel import func, select, tuple_
 
 from app.api.deps import AdminUser, CurrentUser, get_db
+from app.api.pagination import decode_cursor, encode_cursor
 from app.models.user import User, UserRole
+from app.schemas.auth import PASSWORD_MAX_LENGTH, PASSWORD_MIN_LENGTH
 from app.schemas.user import (
     PasswordChangeRequest,
+    PasswordResetRequest,
     UserCreate,
     UserInviteRequest,
     UserInviteResponse,
@@ -17,7 +21,7 @@ from app.schemas.user import (
     UserResponse,
     UserUpdate,
 )
-from app.services.auth import get_password_hash, verify_password
+from app.services.auth import email_exists, get_password_hash_async, verify_password_async
 
 router = APIRouter()
 
@@ -25,7 +29,7 @@ router = APIRouter()
 def user_to_response(user: User) -> UserResponse:
     """Convert User model to response."""
     return UserResponse(
-        id=str(user.id),
+        id=user.id,
         email=user.email,
         name=user.name,
         role=user.role,
@@ -36,60 +40,121 @@ def user_to_response(user: User) -> UserResponse:
     )
 
 
+def _keeps_an_admin(tenant_id: uuid.UUID) -> ColumnElement[bool]:
+    """
+    WHERE guard for writes that could remove an admin.
+
+    Matches users who are not admins, or admins while another active admin
+    remains. Under READ COMMITTED two concurrent writes can both see the
+    other admin, so callers take _lock_admins first.
+    """
+    active_admins = (
+        select(func.count(User.id))
+        .where(
+            User.tenant_id == tenant_id,
+            User.role == UserRole.ADMIN,
+            User.is_active == True,
+        )
+        .scalar_subquery()
+    )
+    return or_(User.role != UserRole.ADMIN, active_admins > 1)
+
+
+async def _lock_admins(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Serialize writes that could remove one of the tenant's active admins."""
+    await db.execute(
+        select(User.id)
+        .where(
+            User.tenant_id == tenant_id,
+            User.role == UserRole.ADMIN,
+            User.is_active == True,
+        )
+        .with_for_update()
+    )
+
+
+async def _raise_unmatched_user(
+    db: AsyncSession, user_id: uuid.UUID, tenant_id: uuid.UUID, last_admin_detail: str
+) -> NoReturn:
+    """Explain why a guarded write matched no row: missing user or last admin."""
+    found = await db.scalar(
+        select(User.id).where(User.id == user_id, User.tenant_id == tenant_id)
+    )
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=last_admin_detail,
+    )
+
+
 @router.get("", response_model=UserListResponse)
 async def list_users(
     current_user: AdminUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(50, ge=1, le=100),
     role: UserRole | None = None,
     is_active: bool | None = None,
     search: str | None = None,
-):
+    cursor: str | None = None,
+) -> ORJSONResponse:
     """
     List all users in the tenant.
 
+    Pages are ordered by (created_at, id) descending. Pass the returned
+    next_cursor to fetch the following page; skip is ignored when a cursor
+    is given and is kept only for existing clients.
+
     Admin only.
     """
-    query = select(User).where(User.tenant_id == current_user.tenant_id)
-
+    filters = [User.tenant_id == current_user.tenant_id]
     if role:
-        query = query.where(User.role == role)
+        filters.append(User.role == role)
     if is_active is not None:
-        query = query.where(User.is_active == is_active)
+        filters.append(User.is_active == is_active)
     if search:
         search_pattern = f"%{search}%"
-        query = query.where(
-            (User.email.ilike(search_pattern)) | (User.name.ilike(search_pattern))
+        filters.append((User.email.ilike(search_pattern)) | (User.name.ilike(search_pattern)))
+
+    if cursor:
+        # Keyset page: an index range scan however deep the page is. The
+        # total must ignore the cursor, so it is a scalar subquery here.
+        total_column = select(func.count(User.id)).where(*filters).scalar_subquery()
+        query = select(User, total_column.label("total")).where(
+            *filters, tuple_(User.created_at, User.id) < tuple_(*decode_cursor(cursor))
         )
-
-    # Get total count
-    count_query = select(func.count(User.id)).where(
-        User.tenant_id == current_user.tenant_id
-    )
-    if role:
-        count_query = count_query.where(User.role == role)
-    if is_active is not None:
-        count_query = count_query.where(User.is_active == is_active)
-    if search:
-        count_query = count_query.where(
-            (User.email.ilike(search_pattern)) | (User.name.ilike(search_pattern))
+    else:
+        # The window count rides along with the page, so one round trip serves both
+        query = (
+            select(User, func.count().over().label("total")).where(*filters).offset(skip)
         )
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
-
-    # Get paginated results
-    query = query.order_by(User.created_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    users = result.scalars().all()
-
-    return UserListResponse(
+    # Fetch one extra row to learn whether another page exists
+    query = query.order_by(User.created_at.desc(), User.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    users = [user for user, _ in rows]
+    if rows:
+        total = rows[0].total
+    elif skip or cursor:
+        # Past the last page there is no row to carry the count
+        total = (await db.execute(select(func.count(User.id)).where(*filters))).scalar_one()
+    else:
+        total = 0
+
+    body = UserListResponse(
         items=[user_to_response(u) for u in users],
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=encode_cursor(users[-1].created_at, users[-1].id) if has_more else None,
     )
+    return ORJSONResponse(body.model_dump(mode="json"))
 
 
 @router.post("", response_model=UserResponse)
@@ -104,8 +169,7 @@ async def create_user(
     Admin only.
     """
     # Check if email already exists
-    existing = await db.execute(select(User).where(User.email == request.email))
-    if existing.scalar_one_or_none():
+    if await email_exists(db, request.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -115,13 +179,12 @@ async def create_user(
         tenant_id=current_user.tenant_id,
         email=request.email,
         name=request.name,
-        password_hash=get_password_hash(request.password) if request.password else None,
+        password_hash=await get_password_hash_async(request.password) if request.password else None,
         role=request.role,
         is_active=True,
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
 
     return user_to_response(user)
 
@@ -142,9 +205,7 @@ async def update_current_user_profile(
     if name is not None:
         current_user.name = name
 
-    current_user.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(current_user)
 
     return user_to_response(current_user)
 
@@ -162,14 +223,13 @@ async def change_password(
             detail="Cannot change password for OAuth users",
         )
 
-    if not verify_password(request.current_password, current_user.password_hash):
+    if not await verify_password_async(request.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
 
-    current_user.password_hash = get_password_hash(request.new_password)
-    current_user.updated_at = datetime.utcnow()
+    current_user.password_hash = await get_password_hash_async(request.new_password)
     await db.commit()
 
     return {"message": "Password changed successfully"}
@@ -215,51 +275,31 @@ async def update_user(
 
     Admin only.
     """
-    result = await db.execute(
-        select(User).where(
-            User.id == user_id,
-            User.tenant_id == current_user.tenant_id,
-        )
-    )
-    user = result.scalar_one_or_none()
-
-    if not user:
+    # Prevent deactivating self
+    if user_id == current_user.id and request.is_active is False:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot deactivate yourself",
         )
 
+    changes = request.model_dump(exclude_none=True)
+    if not changes:
+        return await get_user(user_id, current_user, db)
+
+    stmt = update(User).where(User.id == user_id, User.tenant_id == current_user.tenant_id)
     # Prevent demoting the last admin
-    if request.role and request.role != UserRole.ADMIN and user.role == UserRole.ADMIN:
-        admin_count = await db.execute(
-            select(func.count(User.id)).where(
-                User.tenant_id == current_user.tenant_id,
-                User.role == UserRole.ADMIN,
-                User.is_active == True,
-            )
+    if request.role is not None and request.role != UserRole.ADMIN:
+        await _lock_admins(db, current_user.tenant_id)
+        stmt = stmt.where(_keeps_an_admin(current_user.tenant_id))
+
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and refresh
+    user = await db.scalar(stmt.values(**changes).returning(User))
+    if user is None:
+        await _raise_unmatched_user(
+            db, user_id, current_user.tenant_id, "Cannot demote the last admin"
         )
-        if admin_count.scalar_one() <= 1:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot demote the last admin",
-            )
-
-    if request.name is not None:
-        user.name = request.name
-    if request.role is not None:
-        user.role = request.role
-    if request.is_active is not None:
-        # Prevent deactivating self
-        if user.id == current_user.id and not request.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot deactivate yourself",
-            )
-        user.is_active = request.is_active
-
-    user.updated_at = datetime.utcnow()
+
     await db.commit()
-    await db.refresh(user)
 
     return user_to_response(user)
 
@@ -281,36 +321,22 @@ async def delete_user(
             detail="Cannot delete yourself",
         )
 
-    result = await db.execute(
-        select(User).where(
+    # Prevent deleting the last admin, in the same statement as the delete
+    await _lock_admins(db, current_user.tenant_id)
+    deleted = await db.scalar(
+        delete(User)
+        .where(
             User.id == user_id,
             User.tenant_id == current_user.tenant_id,
+            _keeps_an_admin(current_user.tenant_id),
         )
+        .returning(User.id)
     )
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    # Prevent deleting the last admin
-    if user.role == UserRole.ADMIN:
-        admin_count = await db.execute(
-            select(func.count(User.id)).where(
-                User.tenant_id == current_user.tenant_id,
-                User.role == UserRole.ADMIN,
-                User.is_active == True,
-            )
+    if deleted is None:
+        await _raise_unmatched_user(
+            db, user_id, current_user.tenant_id, "Cannot delete the last admin"
         )
-        if admin_count.scalar_one() <= 1:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot delete the last admin",
-            )
 
-    await db.delete(user)
     await db.commit()
 
     return {"message": "User deleted"}
@@ -329,8 +355,7 @@ async def invite_user(
     User will need to set password via reset or use OAuth.
     """
     # Check if email already exists
-    existing = await db.execute(select(User).where(User.email == request.email))
-    if existing.scalar_one_or_none():
+    if await email_exists(db, request.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -345,12 +370,11 @@ async def invite_user(
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
 
     # TODO: Send invitation email with password setup link
 
     return UserInviteResponse(
-        user_id=str(user.id),
+        user_id=user.id,
         email=user.email,
         message="User invited. They can login using Google OAuth or request a password reset.",
     )
@@ -361,29 +385,42 @@ async def reset_user_password(
     user_id: uuid.UUID,
     current_user: AdminUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    new_password: str,
+    request: PasswordResetRequest | None = None,
+    new_password: str | None = Query(
+        None,
+        min_length=PASSWORD_MIN_LENGTH,
+        max_length=PASSWORD_MAX_LENGTH,
+        deprecated=True,
+        description="Deprecated: send new_password in the request body",
+    ),
 ):
     """
     Reset a user's password.
 
     Admin only.
     """
-    result = await db.execute(
-        select(User).where(
-            User.id == user_id,
-            User.tenant_id == current_user.tenant_id,
+    if request is not None:
+        new_password = request.new_password
+    if new_password is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="new_password is required",
         )
+
+    password_hash = await get_password_hash_async(new_password)
+    updated = await db.scalar(
+        update(User)
+        .where(User.id == user_id, User.tenant_id == current_user.tenant_id)
+        .values(password_hash=password_hash)
+        .returning(User.id)
     )
-    user = result.scalar_one_or_none()
 
-    if not user:
+    if updated is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    user.password_hash = get_password_hash(new_password)
-    user.updated_at = datetime.utcnow()
     await db.commit()
 
     return {"message": "Password reset successfully"}
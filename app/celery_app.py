@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 
 from app.config import settings
 
@@ -11,10 +12,13 @@ celery_app = Celery(
 
 # Celery configuration
 celery_app.conf.update(
-    # Task settings
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    # Task settings. Payloads are ids, numbers and short strings, which
+    # msgpack encodes smaller and faster than JSON; JSON stays accepted so
+    # messages queued before the switch still run.
+    task_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    result_serializer="msgpack",
+    event_serializer="msgpack",
     timezone="UTC",
     enable_utc=True,
 
@@ -24,7 +28,21 @@ celery_app.conf.update(
     task_time_limit=1800,  # 30 minutes max per task
     task_soft_time_limit=1500,  # 25 minutes soft limit
 
-    # Worker settings
+    # Queues. Transcription and analysis go to "cpu"; the Biztel sync,
+    # queueing and housekeeping tasks mostly wait on the network or the
+    # database and go to "io". A worker started without -Q consumes both,
+    # so a single worker keeps working. Split deployments run e.g.
+    #   celery -A app.celery_app worker -Q cpu -c 4 --prefetch-multiplier=1
+    #   celery -A app.celery_app worker -Q io -c 16 --prefetch-multiplier=4
+    # The tasks drive asyncio loops through run_async, so the io worker stays
+    # on prefork rather than gevent.
+    task_queues=(Queue("cpu"), Queue("io")),
+    task_default_queue="io",
+    task_routes={
+        "app.tasks.analysis.process_single_call": {"queue": "cpu"},
+    },
+
+    # Worker settings (defaults for the cpu queue; override per worker)
     worker_prefetch_multiplier=1,
     worker_concurrency=4,
 
@@ -52,5 +70,13 @@ celery_app.conf.update(
             "task": "app.tasks.analysis.cleanup_expired_files",
             "schedule": 60 * 60 * 6,  # Every 6 hours
         },
+        "refresh-dashboard-stats": {
+            "task": "app.tasks.analysis.refresh_dashboard_stats",
+            "schedule": 60 * 15,  # Every 15 minutes
+        },
+        "ensure-partitions": {
+            "task": "app.tasks.analysis.ensure_partitions",
+            "schedule": 60 * 60 * 24,  # Every 24 hours
+        },
     },
 )
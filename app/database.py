@@ -1,14 +1,54 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
 
 from app.config import settings
 
+
+def async_database_url(database_url: str) -> URL:
+    """Force the asyncpg driver for PostgreSQL URLs (e.g. a plain postgresql://)."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() != "asyncpg":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def _engine_options(url: URL) -> dict[str, Any]:
+    """Pool and driver options; only PostgreSQL (asyncpg) gets the tuned pool."""
+    # Log checkouts/overflow in debug to spot pool saturation
+    options: dict[str, Any] = {
+        "echo_pool": settings.DEBUG,
+        # Sized so the per-request statements never evict each other; a miss
+        # recompiles the SQL and, on asyncpg, re-prepares it on the server
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    if url.get_backend_name() != "postgresql":
+        return options
+    return options | {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # Short OLTP queries only pay JIT compile time, never recoup it
+            "server_settings": {"jit": "off"},
+        },
+    }
+
+
+database_url = async_database_url(settings.DATABASE_URL)
+
 engine = create_async_engine(
-    settings.DATABASE_URL,
+    database_url,
     echo=settings.DEBUG,
     future=True,
+    **_engine_options(database_url),
 )
 
 async_session_maker = async_sessionmaker(
@@ -31,5 +71,3 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
@@ -3,9 +3,12 @@ from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.api.v1 import router as api_v1_router
+from app.services.biztel import BiztelClientFactory
+from app.services.cache import get_response_cache
 
 
 @asynccontextmanager
@@ -13,6 +16,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     yield
     # Shutdown
+    await get_response_cache().close()
+    await BiztelClientFactory.close_all()
 
 
 app = FastAPI(
@@ -22,6 +27,7 @@ app = FastAPI(
     docs_url="/api/docs" if settings.DEBUG else None,
     redoc_url="/api/redoc" if settings.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -0,0 +1,97 @@
+"""
+Helpers for Alembic data migrations.
+
+Revision scripts import these instead of issuing one INSERT per row or
+loading a whole table into memory. Any data migration should read with
+stream_batches and write with bulk_insert_batched or batched_write.
+"""
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+
+# PostgreSQL handles multi-row inserts best at around 1,000 rows per batch
+DEFAULT_BATCH_SIZE = 1000
+
+
+def chunked(rows: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[list[Any]]:
+    """Yield successive lists of at most batch_size items."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, batch_size)):
+        yield chunk
+
+
+def bulk_insert_batched(
+    table: sa.Table | sa.TableClause,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Insert rows in multi-row batches via op.bulk_insert.
+
+    Args:
+        table: Table or lightweight sa.table() clause to insert into
+        rows: Row dicts keyed by column name
+        batch_size: Maximum rows per INSERT statement
+
+    Returns:
+        Number of rows inserted
+    """
+    inserted = 0
+    for chunk in chunked(rows, batch_size):
+        op.bulk_insert(table, chunk)
+        inserted += len(chunk)
+    return inserted
+
+
+def stream_batches(
+    conn: sa.Connection,
+    select_stmt: sa.Select,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Sequence[sa.Row]]:
+    """
+    Iterate a SELECT in batches over a server-side cursor.
+
+    Args:
+        conn: Migration connection (op.get_bind())
+        select_stmt: Statement to stream
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Lists of at most batch_size rows
+    """
+    result = conn.execution_options(yield_per=batch_size).execute(select_stmt)
+    yield from result.partitions()
+
+
+def batched_write(
+    conn: sa.Connection,
+    table: sa.Table | sa.TableClause,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Insert rows in batches, committing each batch.
+
+    Each batch runs in its own autocommit block, so a long backfill does not
+    hold one huge transaction open. The server-side cursor behind
+    stream_batches does not survive a commit, so materialize the source
+    rows per batch (or page by key) before writing with this helper.
+
+    Args:
+        conn: Migration connection (op.get_bind())
+        table: Table or lightweight sa.table() clause to insert into
+        rows: Row dicts keyed by column name
+        batch_size: Maximum rows per INSERT statement
+
+    Returns:
+        Number of rows inserted
+    """
+    inserted = 0
+    for chunk in chunked(rows, batch_size):
+        with op.get_context().autocommit_block():
+            conn.execute(table.insert(), chunk)
+        inserted += len(chunk)
+    return inserted
@@ -6,6 +6,7 @@ from app.models.call_record import CallRecord, AnalysisStatus
 from app.models.analysis_result import AnalysisResult
 from app.models.emotion_data import EmotionData
 from app.models.analysis_prompt import AnalysisPrompt, PromptType
+from app.models.dashboard_stats import DashboardDailyStats
 
 __all__ = [
     "Tenant",
@@ -19,4 +20,5 @@ __all__ = [
     "EmotionData",
     "AnalysisPrompt",
     "PromptType",
+    "DashboardDailyStats",
 ]
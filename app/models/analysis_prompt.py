@@ -2,8 +2,12 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy import CheckConstraint, Column, Index, text
 from sqlmodel import Field, SQLModel
 
+from app.models.timestamps import updated_at_field
+from app.models.types import SmallIntEnum
+
 
 class PromptType(str, Enum):
     """Types of analysis prompts."""
@@ -17,14 +21,30 @@ class PromptType(str, Enum):
 
 class AnalysisPrompt(SQLModel, table=True):
     __tablename__ = "analysis_prompts"
+    __table_args__ = (
+        CheckConstraint(
+            f"prompt_type BETWEEN 0 AND {len(PromptType) - 1}",
+            name="ck_analysis_prompts_prompt_type",
+        ),
+        # Serves the "active default prompt for tenant/type" lookup
+        Index(
+            "ix_prompts_tenant_type_active",
+            "tenant_id",
+            "prompt_type",
+            postgresql_where=text("is_active AND is_default"),
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     tenant_id: uuid.UUID = Field(foreign_key="tenants.id", index=True)
-    prompt_type: PromptType = Field(index=True)
+    prompt_type: PromptType = Field(
+        sa_column=Column(SmallIntEnum(PromptType), nullable=False),
+    )
     name: str = Field(max_length=255)
     description: str | None = Field(default=None, max_length=1000)
     prompt_text: str = Field(default="")
     is_active: bool = Field(default=True)
     is_default: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
@@ -2,15 +2,27 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
+from app.models.ids import uuid7
+from app.models.timestamps import updated_at_field
+
 
 class AnalysisResult(SQLModel, table=True):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        Index(
+            "ix_analysis_results_compliance_details_gin",
+            "compliance_details",
+            postgresql_using="gin",
+            postgresql_ops={"compliance_details": "jsonb_path_ops"},
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     call_record_id: uuid.UUID = Field(foreign_key="call_records.id", unique=True, index=True)
     transcript: str | None = Field(default=None)
     flow_compliance: bool | None = Field(default=None)
@@ -20,4 +32,4 @@ class AnalysisResult(SQLModel, table=True):
     silence_duration: float | None = Field(default=None, ge=0)
     summary: str | None = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
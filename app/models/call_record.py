@@ -2,8 +2,13 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy import CheckConstraint, Column, Index, UniqueConstraint, text
 from sqlmodel import Field, SQLModel
 
+from app.models.ids import uuid7
+from app.models.timestamps import updated_at_field
+from app.models.types import SmallIntEnum
+
 
 class AnalysisStatus(str, Enum):
     PENDING = "pending"
@@ -14,12 +19,51 @@ class AnalysisStatus(str, Enum):
 
 class CallRecord(SQLModel, table=True):
     __tablename__ = "call_records"
+    __table_args__ = (
+        # Biztel sync upserts on this; uploads without a request_id are unaffected
+        UniqueConstraint("tenant_id", "request_id", name="uq_call_records_tenant_request"),
+        # Dashboard/listing queries filter by tenant and sort by newest first
+        Index(
+            "ix_call_records_tenant_event",
+            "tenant_id",
+            text("event_datetime DESC"),
+            text("id DESC"),
+        ),
+        # list_calls filters, matching its (event_datetime, id) DESC keyset order
+        Index(
+            "ix_call_records_tenant_operator_event",
+            "tenant_id",
+            "operator_id",
+            text("event_datetime DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_call_records_tenant_status_event",
+            "tenant_id",
+            "analysis_status",
+            text("event_datetime DESC"),
+            text("id DESC"),
+        ),
+        # Worker queue scan: only unfinished calls are indexed
+        Index(
+            "ix_call_records_pending",
+            "tenant_id",
+            "event_datetime",
+            postgresql_where=text("analysis_status IN (0, 1)"),  # PENDING, PROCESSING
+        ),
+        CheckConstraint(
+            f"analysis_status BETWEEN 0 AND {len(AnalysisStatus) - 1}",
+            name="ck_call_records_analysis_status",
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    tenant_id: uuid.UUID = Field(foreign_key="tenants.id", index=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    # Both led by the composite indexes and the (tenant_id, request_id) constraint
+    tenant_id: uuid.UUID = Field(foreign_key="tenants.id")
     biztel_id: str | None = Field(default=None, max_length=255, index=True)
-    request_id: str | None = Field(default=None, max_length=255, index=True)
-    event_datetime: datetime = Field(index=True)
+    request_id: str | None = Field(default=None, max_length=255)
+    event_datetime: datetime
     call_center_name: str | None = Field(default=None, max_length=255)
     call_center_extension: str | None = Field(default=None, max_length=50)
     business_label: str | None = Field(default=None, max_length=255)
@@ -34,6 +78,9 @@ class CallRecord(SQLModel, table=True):
     wait_time_seconds: int | None = Field(default=None)
     talk_time_seconds: int | None = Field(default=None)
     audio_file_path: str | None = Field(default=None, max_length=512)
-    analysis_status: AnalysisStatus = Field(default=AnalysisStatus.PENDING, index=True)
+    analysis_status: AnalysisStatus = Field(
+        default=AnalysisStatus.PENDING,
+        sa_column=Column(SmallIntEnum(AnalysisStatus), nullable=False),
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
@@ -0,0 +1,32 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from app.models.timestamps import updated_at_field
+
+# Stats for calls without an operator are stored under this id so the
+# composite primary key never contains NULL
+UNASSIGNED_OPERATOR_ID = uuid.UUID(int=0)
+
+
+class DashboardDailyStats(SQLModel, table=True):
+    """Per tenant/operator/day rollup of call and analysis metrics."""
+
+    __tablename__ = "dashboard_daily_stats"
+    __table_args__ = (Index("ix_dashboard_daily_stats_tenant_day", "tenant_id", "day"),)
+
+    tenant_id: uuid.UUID = Field(foreign_key="tenants.id", primary_key=True)
+    operator_id: uuid.UUID = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    calls: int = Field(default=0)
+    analyzed_calls: int = Field(default=0)
+    # Sums rather than averages so the dashboard can aggregate across days
+    score_sum: float = Field(default=0)
+    fillers_sum: int = Field(default=0)
+    silence_sum: float = Field(default=0)
+    compliance_checked_calls: int = Field(default=0)
+    compliant_calls: int = Field(default=0)
+    updated_at: datetime = updated_at_field()
+    __mapper_args__ = {"eager_defaults": True}
@@ -6,14 +6,18 @@ from sqlalchemy import Column
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
+from app.models.ids import uuid7
+
 
 class EmotionData(SQLModel, table=True):
     __tablename__ = "emotion_data"
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     analysis_id: uuid.UUID = Field(foreign_key="analysis_results.id", index=True)
     timestamp: float = Field(ge=0)
     emotion_type: str = Field(max_length=50)
     confidence: float = Field(ge=0, le=1)
+    # Write-only payload (LZ4-compressed); nothing filters on it, so no GIN index
     audio_features: dict[str, Any] | None = Field(default=None, sa_column=Column(JSONB))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Partition key (RANGE by month), so it is part of the primary key
+    created_at: datetime = Field(default_factory=datetime.utcnow, primary_key=True)
@@ -2,13 +2,24 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
+from app.models.timestamps import updated_at_field
+
 
 class OperationFlow(SQLModel, table=True):
     __tablename__ = "operation_flows"
+    __table_args__ = (
+        Index(
+            "ix_operation_flows_flow_definition_gin",
+            "flow_definition",
+            postgresql_using="gin",
+            postgresql_ops={"flow_definition": "jsonb_path_ops"},
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     tenant_id: uuid.UUID = Field(foreign_key="tenants.id", index=True)
@@ -17,4 +28,4 @@ class OperationFlow(SQLModel, table=True):
     flow_definition: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONB))
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
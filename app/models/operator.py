@@ -1,17 +1,30 @@
 import uuid
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
+from app.models.timestamps import updated_at_field
+
 
 class Operator(SQLModel, table=True):
     __tablename__ = "operators"
+    __table_args__ = (
+        # Biztel sync resolves a batch's operators with an index-only scan
+        Index(
+            "ix_operators_tenant_biztel",
+            "tenant_id",
+            "biztel_operator_id",
+            postgresql_include=["id"],
+        ),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     tenant_id: uuid.UUID = Field(foreign_key="tenants.id", index=True)
-    biztel_operator_id: str = Field(max_length=255, index=True)
+    biztel_operator_id: str = Field(max_length=255)
     name: str = Field(max_length=255)
     user_id: uuid.UUID | None = Field(default=None, foreign_key="users.id")
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
@@ -3,9 +3,12 @@ from datetime import datetime
 
 from sqlmodel import Field, SQLModel
 
+from app.models.timestamps import updated_at_field
+
 
 class Tenant(SQLModel, table=True):
     __tablename__ = "tenants"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(max_length=255, index=True)
@@ -13,5 +16,6 @@ class Tenant(SQLModel, table=True):
     biztel_api_secret: str | None = Field(default=None, max_length=512)
     biztel_base_url: str | None = Field(default=None, max_length=512)
     is_active: bool = Field(default=True)
+    first_admin_assigned: bool = Field(default=False)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
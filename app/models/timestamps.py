@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, FetchedValue
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlmodel import Field
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time as a naive timestamp, evaluated by the database.
+
+    Timestamp columns are naive UTC, so plain now() would store the
+    connection's TimeZone wall clock on PostgreSQL.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element: utcnow, compiler: Any, **kw: Any) -> str:
+    return "timezone('utc', now())"
+
+
+@compiles(utcnow)
+def _utcnow_default(element: utcnow, compiler: Any, **kw: Any) -> str:
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+def updated_at_field() -> Any:
+    """
+    updated_at column that the database bumps on every UPDATE.
+
+    The set_updated_at trigger (alembic revision 012) does the bumping,
+    ON CONFLICT DO UPDATE included. ORM inserts still stamp it in Python,
+    alongside created_at; raw and Core inserts fall back to the server
+    default. Models using it set eager_defaults so the trigger's value comes
+    back via UPDATE ... RETURNING instead of being expired, which would force
+    a lazy load under asyncio.
+    """
+    return Field(
+        default_factory=datetime.utcnow,
+        sa_column_kwargs={"server_default": utcnow(), "server_onupdate": FetchedValue()},
+    )
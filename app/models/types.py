@@ -0,0 +1,39 @@
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+
+class SmallIntEnum(TypeDecorator):
+    """
+    Store a Python Enum as a SMALLINT code.
+
+    Codes follow the enum's declaration order, so new members must only be
+    appended. The matching CHECK constraint replaces a native ENUM type,
+    which would need ALTER TYPE (and a catalog lock) to extend.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[Enum], *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._members = tuple(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+
+    @property
+    def max_code(self) -> int:
+        return len(self._members) - 1
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> int | None:
+        if value is None:
+            return None
+        return self._codes[self.enum_class(value)]
+
+    def process_result_value(self, value: int | None, dialect: Dialect) -> Enum | None:
+        if value is None:
+            return None
+        return self._members[value]
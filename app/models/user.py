@@ -2,8 +2,12 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy import CheckConstraint, Column, Index, text
 from sqlmodel import Field, SQLModel
 
+from app.models.timestamps import updated_at_field
+from app.models.types import SmallIntEnum
+
 
 class UserRole(str, Enum):
     ADMIN = "admin"
@@ -15,14 +19,45 @@ class UserRole(str, Enum):
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Email lookups are case-insensitive
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+        # list_users keyset order, unfiltered and filtered by is_active
+        Index("ix_users_tenant_created_id", "tenant_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_users_tenant_active_created",
+            "tenant_id",
+            "is_active",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # list_users search: substring ILIKE on email or name (needs pg_trgm)
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        CheckConstraint(f"role BETWEEN 0 AND {len(UserRole) - 1}", name="ck_users_role"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     tenant_id: uuid.UUID = Field(foreign_key="tenants.id", index=True)
     email: str = Field(max_length=255, unique=True, index=True)
     password_hash: str | None = Field(default=None, max_length=255)
     google_id: str | None = Field(default=None, max_length=255, unique=True)
-    role: UserRole = Field(default=UserRole.OPERATOR)
+    role: UserRole = Field(
+        default=UserRole.OPERATOR,
+        sa_column=Column(SmallIntEnum(UserRole), nullable=False),
+    )
     name: str = Field(max_length=255)
     is_active: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = updated_at_field()
@@ -1,7 +1,14 @@
-from pydantic import BaseModel, EmailStr
+import uuid
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from app.models.user import UserRole
 
+# Bounds for newly chosen passwords; the maximum is a plain input bound (in
+# characters) that keeps oversized inputs away from the KDF
+PASSWORD_MIN_LENGTH = 8
+PASSWORD_MAX_LENGTH = 72
+
 
 class Token(BaseModel):
     access_token: str
@@ -22,7 +29,7 @@ class LoginRequest(BaseModel):
 
 class RegisterRequest(BaseModel):
     email: EmailStr
-    password: str
+    password: str = Field(..., min_length=PASSWORD_MIN_LENGTH, max_length=PASSWORD_MAX_LENGTH)
     name: str
     tenant_name: str | None = None  # Required for new tenant creation
 
@@ -36,14 +43,13 @@ class RefreshTokenRequest(BaseModel):
 
 
 class UserResponse(BaseModel):
-    id: str
+    id: uuid.UUID
     email: str
     name: str
     role: UserRole
-    tenant_id: str
+    tenant_id: uuid.UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuthResponse(BaseModel):
@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+from app.models.call_record import AnalysisStatus
+
+
+class CallListItem(BaseModel):
+    """Call record row in list responses."""
+    id: uuid.UUID
+    event_datetime: datetime
+    operator_id: uuid.UUID | None
+    caller_number: str | None
+    callee_number: str | None
+    talk_time_seconds: int | None
+    analysis_status: AnalysisStatus
+    inquiry_category: str | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Validates a whole page of rows in a single pydantic-core call
+call_list_items = TypeAdapter(list[CallListItem])
+
+
+class CallListResponse(BaseModel):
+    """Keyset-paginated list of call records."""
+    items: list[CallListItem]
+    next_cursor: str | None
+    limit: int
+
+
+class CallDetailResponse(BaseModel):
+    """Full call record details."""
+    id: uuid.UUID
+    biztel_id: str | None
+    request_id: str | None
+    event_datetime: datetime
+    call_center_name: str | None
+    call_center_extension: str | None
+    business_label: str | None
+    operator_id: uuid.UUID | None
+    operation_flow_id: uuid.UUID | None
+    inquiry_category: str | None
+    event_type: str | None
+    caller_number: str | None
+    callee_number: str | None
+    wait_time_seconds: int | None
+    talk_time_seconds: int | None
+    audio_file_path: str | None
+    audio_signed_url: str | None = None
+    analysis_status: AnalysisStatus
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AnalysisDetail(BaseModel):
+    """Analysis result for a call."""
+    id: uuid.UUID
+    transcript: str | None
+    flow_compliance: bool | None
+    compliance_details: dict[str, Any] | None
+    overall_score: float | None
+    fillers_count: int | None
+    silence_duration: float | None
+    summary: str | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CallAnalysisResponse(BaseModel):
+    """Analysis status and result for a call."""
+    call_id: uuid.UUID
+    status: AnalysisStatus
+    analysis: AnalysisDetail | None
@@ -1,10 +1,11 @@
+import uuid
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 
 class AudioUploadResponse(BaseModel):
     """Response for audio file upload."""
-    call_record_id: str
+    call_record_id: uuid.UUID
     blob_path: str
     signed_url: str
     expires_at: str
@@ -1,15 +1,19 @@
+import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from app.models.user import UserRole
+from app.schemas.auth import PASSWORD_MAX_LENGTH, PASSWORD_MIN_LENGTH
 
 
 class UserCreate(BaseModel):
     """Request to create a new user."""
     email: EmailStr
     name: str = Field(..., min_length=1, max_length=255)
-    password: str | None = Field(None, min_length=8)
+    password: str | None = Field(
+        None, min_length=PASSWORD_MIN_LENGTH, max_length=PASSWORD_MAX_LENGTH
+    )
     role: UserRole = UserRole.OPERATOR
 
 
@@ -22,7 +26,7 @@ class UserUpdate(BaseModel):
 
 class UserResponse(BaseModel):
     """Response with user details."""
-    id: str
+    id: uuid.UUID
     email: str
     name: str
     role: UserRole
@@ -31,8 +35,7 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserInviteRequest(BaseModel):
@@ -44,7 +47,7 @@ class UserInviteRequest(BaseModel):
 
 class UserInviteResponse(BaseModel):
     """Response from user invitation."""
-    user_id: str
+    user_id: uuid.UUID
     email: str
     invite_url: str | None = None  # For email invitation link
     message: str
@@ -56,9 +59,19 @@ class UserListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: str | None = None
 
 
 class PasswordChangeRequest(BaseModel):
     """Request to change password."""
     current_password: str
-    new_password: str = Field(..., min_length=8)
+    new_password: str = Field(
+        ..., min_length=PASSWORD_MIN_LENGTH, max_length=PASSWORD_MAX_LENGTH
+    )
+
+
+class PasswordResetRequest(BaseModel):
+    """Request to reset another user's password."""
+    new_password: str = Field(
+        ..., min_length=PASSWORD_MIN_LENGTH, max_length=PASSWORD_MAX_LENGTH
+    )
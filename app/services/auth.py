@@ -1,29 +1,80 @@
+import asyncio
+import os
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from cachetools import TTLCache
+from google.auth import exceptions as google_exceptions
 from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from pydantic import ValidationError
+from sqlalchemy import bindparam, exists, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import func, or_, select, update
 
 from app.config import settings
 from app.models.tenant import Tenant
 from app.models.user import User, UserRole
 from app.schemas.auth import Token, TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use argon2id; bcrypt stays listed so existing hashes still
+# verify, and deprecated="auto" flags them for rehashing on the next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+    argon2__memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+# Password KDFs are CPU-bound; run them off the event loop on a pool bounded to the core count
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password; also return a new hash when the stored one is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
 def create_access_token(user_id: str) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {
@@ -51,22 +102,76 @@ def create_tokens(user_id: str) -> Token:
     )
 
 
+# Decoded tokens are cached by their raw string, so a client reusing its
+# bearer token skips the signature check and payload validation. Only valid
+# tokens are cached, and expiry is rechecked on every hit.
+TOKEN_CACHE_TTL_SECONDS = 300
+_token_cache: TTLCache[str, TokenPayload] = TTLCache(maxsize=4096, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
 def decode_token(token: str) -> TokenPayload | None:
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached.exp > time.time():
+            return cached
+        _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return TokenPayload(**payload)
-    except JWTError:
+        token_payload = TokenPayload(**payload)
+    except (JWTError, ValidationError):
         return None
+    _token_cache[token] = token_payload
+    return token_payload
+
+
+# Google rotates its ID token signing certificates roughly daily
+GOOGLE_CERTS_TTL_SECONDS = 3600
+_google_certs_cache: TTLCache = TTLCache(maxsize=4, ttl=GOOGLE_CERTS_TTL_SECONDS)
+
+
+# Token verification runs on worker threads; TTLCache itself is not thread-safe
+_google_certs_lock = threading.Lock()
+
+
+class _CachedCertsRequest(google_requests.Request):
+    """Transport that caches successful GET responses (Google's public certs)."""
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=120, **kwargs):
+        if method != "GET" or body is not None:
+            return super().__call__(url, method, body, headers, timeout, **kwargs)
+
+        with _google_certs_lock:
+            response = _google_certs_cache.get(url)
+        if response is None:
+            response = super().__call__(url, method, body, headers, timeout, **kwargs)
+            if response.status == 200:
+                with _google_certs_lock:
+                    _google_certs_cache[url] = response
+        return response
+
+
+# Shared so the underlying requests.Session keeps its connection pool
+_google_request = _CachedCertsRequest()
+
+
+def _verify_google_id_token(credential: str) -> dict:
+    try:
+        return id_token.verify_oauth2_token(credential, _google_request, settings.GOOGLE_CLIENT_ID)
+    except google_exceptions.MalformedError as e:
+        # Unknown key id: Google rotated its keys, so refetch once
+        if "Certificate for key id" not in str(e):
+            raise
+        with _google_certs_lock:
+            _google_certs_cache.clear()
+        return id_token.verify_oauth2_token(credential, _google_request, settings.GOOGLE_CLIENT_ID)
 
 
 def verify_google_token(credential: str) -> dict | None:
     """Verify Google ID token and return user info."""
     try:
-        idinfo = id_token.verify_oauth2_token(
-            credential,
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID,
-        )
+        idinfo = _verify_google_id_token(credential)
 
         if idinfo["iss"] not in ["accounts.google.com", "https://accounts.google.com"]:
             return None
@@ -83,24 +188,92 @@ def verify_google_token(credential: str) -> dict | None:
 
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
     """Authenticate user with email and password."""
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    user = await get_user_by_email(db, email)
     if not user or not user.password_hash:
         return None
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await verify_and_update_password_async(password, user.password_hash)
+    if not verified:
         return None
+    if new_hash:
+        # Legacy bcrypt (or outdated argon2 cost): store the upgraded hash
+        user.password_hash = new_hash
+        await db.commit()
     return user
 
 
+# Hot auth lookups as lambda statements: SQLAlchemy caches the construction
+# and cache key, so each request only binds parameters.
+_stmt_user_by_id = lambda_stmt(lambda: select(User).where(User.id == bindparam("user_id")))
+_stmt_user_with_tenant_by_id = lambda_stmt(
+    lambda: select(User, Tenant)
+    .join(Tenant, Tenant.id == User.tenant_id)
+    .where(User.id == bindparam("user_id"))
+)
+_stmt_user_by_email = lambda_stmt(
+    lambda: select(User).where(func.lower(User.email) == bindparam("email"))
+)
+_stmt_email_exists = lambda_stmt(
+    lambda: select(exists().where(func.lower(User.email) == bindparam("email")))
+)
+_stmt_user_by_google_id = lambda_stmt(
+    lambda: select(User).where(User.google_id == bindparam("google_id"))
+)
+_stmt_user_for_google_login = lambda_stmt(
+    lambda: select(User)
+    .where(or_(User.google_id == bindparam("google_id"), func.lower(User.email) == bindparam("email")))
+    .order_by((User.google_id == bindparam("google_id")).desc())
+    .limit(1)
+)
+
+
+async def get_user_by_id(db: AsyncSession, user_id: uuid.UUID | str) -> User | None:
+    """Get user by ID."""
+    result = await db.execute(_stmt_user_by_id, {"user_id": user_id})
+    return result.scalar_one_or_none()
+
+
+async def get_user_with_tenant_by_id(
+    db: AsyncSession, user_id: uuid.UUID | str
+) -> tuple[User, Tenant] | None:
+    """
+    Get a user and their tenant by user ID in one joined query.
+
+    Both rows land in the session's identity map, so a later
+    db.get(Tenant, user.tenant_id) is answered without a round trip.
+    """
+    result = await db.execute(_stmt_user_with_tenant_by_id, {"user_id": user_id})
+    row = result.one_or_none()
+    return None if row is None else (row[0], row[1])
+
+
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
-    """Get user by email."""
-    result = await db.execute(select(User).where(User.email == email))
+    """Get user by email (case-insensitive)."""
+    result = await db.execute(_stmt_user_by_email, {"email": email.lower()})
     return result.scalar_one_or_none()
 
 
+async def email_exists(db: AsyncSession, email: str) -> bool:
+    """Check whether an email is registered (case-insensitive) without loading the user."""
+    return bool(await db.scalar(_stmt_email_exists, {"email": email.lower()}))
+
+
 async def get_user_by_google_id(db: AsyncSession, google_id: str) -> User | None:
     """Get user by Google ID."""
-    result = await db.execute(select(User).where(User.google_id == google_id))
+    result = await db.execute(_stmt_user_by_google_id, {"google_id": google_id})
+    return result.scalar_one_or_none()
+
+
+async def get_user_for_google_login(db: AsyncSession, google_id: str, email: str) -> User | None:
+    """
+    Get user by Google ID, falling back to email, in a single query.
+
+    A user already linked to the Google ID takes precedence over one that
+    only matches by email.
+    """
+    result = await db.execute(
+        _stmt_user_for_google_login,
+        {"google_id": google_id, "email": email.lower()},
+    )
     return result.scalar_one_or_none()
 
 
@@ -119,25 +292,38 @@ async def create_user(
         email=email,
         name=name,
         tenant_id=tenant_id,
-        password_hash=get_password_hash(password) if password else None,
+        password_hash=await get_password_hash_async(password) if password else None,
         google_id=google_id,
         role=role,
     )
     db.add(user)
     await db.commit()
-    await db.refresh(user)
     return user
 
 
-async def create_tenant(db: AsyncSession, name: str) -> Tenant:
+async def create_tenant(db: AsyncSession, name: str, first_admin_assigned: bool = False) -> Tenant:
     """Create a new tenant."""
-    tenant = Tenant(name=name)
+    tenant = Tenant(name=name, first_admin_assigned=first_admin_assigned)
     db.add(tenant)
     await db.commit()
-    await db.refresh(tenant)
     return tenant
 
 
+async def claim_first_admin(db: AsyncSession, tenant_id: uuid.UUID) -> bool:
+    """
+    Atomically mark the tenant's first admin as assigned.
+
+    Returns True only for the caller that flipped the flag, so exactly one
+    user per tenant is granted the ADMIN role on signup.
+    """
+    result = await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id, Tenant.first_admin_assigned == False)  # noqa: E712
+        .values(first_admin_assigned=True)
+    )
+    return result.rowcount == 1
+
+
 async def get_or_create_tenant_for_google_user(db: AsyncSession, email: str) -> Tenant:
     """Get tenant from email domain or create one."""
     domain = email.split("@")[1]
@@ -1,9 +1,11 @@
 import asyncio
+import time
 import uuid
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any
+from typing import Any, BinaryIO
 
 import httpx
 from tenacity import (
@@ -55,6 +57,39 @@ class BiztelNotFoundError(BiztelAPIError):
     pass
 
 
+# Read size when streaming a recording to its file
+RECORDING_CHUNK_SIZE = 64 * 1024
+
+# Connection pool per client; sized for the concurrent recording downloads in a sync
+BIZTEL_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+
+class _TokenBucket:
+    """
+    Async token bucket: up to `capacity` requests may start at once, then
+    starts are admitted at `rate` per second as tokens refill.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        # Waiters queue in order, so a burst cannot starve earlier callers
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._tokens = 1
+                self._updated_at = time.monotonic()
+            self._tokens -= 1
+
+
 @dataclass
 class BiztelCredentials:
     """Biztel API credentials for a tenant."""
@@ -91,8 +126,40 @@ class BiztelClient:
 
     def __init__(self, credentials: BiztelCredentials):
         self.credentials = credentials
-        self._last_request_time: float = 0
-        self._rate_limit_delay = settings.BIZTEL_API_RATE_LIMIT_DELAY
+        # BIZTEL_API_RATE_LIMIT_DELAY is the average spacing; allow one
+        # second's worth of requests to start together
+        rate = 1 / settings.BIZTEL_API_RATE_LIMIT_DELAY
+        self._rate_limiter = _TokenBucket(rate=rate, capacity=max(1.0, rate))
+        self._http: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "BiztelClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client, so requests reuse pooled keep-alive connections.
+
+        The base URL and auth headers are bound once here instead of being
+        rebuilt and merged on every request.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.credentials.base_url,
+                headers=self._get_headers(),
+                timeout=settings.BIZTEL_API_TIMEOUT,
+                limits=BIZTEL_HTTP_LIMITS,
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     def _get_headers(self) -> dict[str, str]:
         """Get authorization headers."""
@@ -103,26 +170,26 @@ class BiztelClient:
 
     async def _rate_limit_wait(self) -> None:
         """Wait to respect rate limit (10 requests/second)."""
-        now = asyncio.get_event_loop().time()
-        elapsed = now - self._last_request_time
-        if elapsed < self._rate_limit_delay:
-            await asyncio.sleep(self._rate_limit_delay - elapsed)
-        self._last_request_time = asyncio.get_event_loop().time()
+        await self._rate_limiter.acquire()
 
     def _parse_datetime(self, dt_str: str | None) -> datetime | None:
-        """Parse Biztel datetime string."""
+        """
+        Parse Biztel datetime string.
+
+        fromisoformat (Python 3.11+) accepts both the "T" and the legacy
+        space-separated "%Y-%m-%d %H:%M:%S" form, so strptime is never needed.
+        """
         if not dt_str:
             return None
         try:
-            return datetime.fromisoformat(dt_str.replace(" ", "T"))
+            return datetime.fromisoformat(dt_str)
         except ValueError:
-            try:
-                return datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                return None
+            return None
 
     @retry(
-        retry=retry_if_exception_type((httpx.TimeoutException, BiztelRateLimitError)),
+        retry=retry_if_exception_type(
+            (httpx.TimeoutException, TimeoutError, BiztelRateLimitError)
+        ),
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
     )
@@ -136,17 +203,21 @@ class BiztelClient:
         """Make a rate-limited request with retry logic."""
         await self._rate_limit_wait()
 
-        url = f"{self.credentials.base_url}{endpoint}"
-
-        async with httpx.AsyncClient(timeout=settings.BIZTEL_API_TIMEOUT) as client:
-            response = await client.request(
+        # httpx times each connect/read separately, so a slowly trickling
+        # response could run on indefinitely; bound the whole attempt
+        async with asyncio.timeout(settings.BIZTEL_API_TIMEOUT):
+            response = await self.http.request(
                 method=method,
-                url=url,
-                headers=self._get_headers(),
+                url=endpoint,
                 params=params,
                 **kwargs,
             )
 
+        self._raise_for_status(response)
+        return response
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        """Map error statuses to Biztel exceptions (the body is not read)."""
         if response.status_code == 401:
             raise BiztelAuthError("Authentication failed", status_code=401)
         if response.status_code == 404:
@@ -157,7 +228,6 @@ class BiztelClient:
             raise BiztelAPIError(f"Server error: {response.status_code}", status_code=response.status_code)
 
         response.raise_for_status()
-        return response
 
     async def get_call_history(
         self,
@@ -201,11 +271,13 @@ class BiztelClient:
         response = await self._request("GET", "/public/api/v1/queue_log", params=params)
         data = response.json()
 
+        # Fallback start time for records without one, read once per page
+        fetched_at = datetime.now(timezone.utc).replace(tzinfo=None)
         records = []
         for item in data.get("results", data if isinstance(data, list) else []):
             record = CallHistoryRecord(
                 request_id=item.get("request_id", ""),
-                start_time=self._parse_datetime(item.get("start_time")) or datetime.utcnow(),
+                start_time=self._parse_datetime(item.get("start_time")) or fetched_at,
                 caller_id=item.get("caller_id"),
                 called_id=item.get("called_id"),
                 hold_time=item.get("hold_time"),
@@ -223,19 +295,19 @@ class BiztelClient:
 
         return records
 
-    async def get_call_history_paginated(
+    async def iter_call_history_pages(
         self,
         start_date: datetime,
         end_date: datetime,
         queue_id: int | None = None,
         events: list[BiztelEventType] | None = None,
-    ) -> list[CallHistoryRecord]:
+    ) -> AsyncIterator[list[CallHistoryRecord]]:
         """
-        Get all call history with pagination support.
+        Yield call history one API page at a time.
 
-        Handles the 10,000 record limit per request by paginating.
+        Handles the 10,000 record limit per request by paginating, so
+        callers only ever hold a single page in memory.
         """
-        all_records: list[CallHistoryRecord] = []
         page_size = 10000
         current_start = start_date
 
@@ -252,7 +324,7 @@ class BiztelClient:
             if not records:
                 break
 
-            all_records.extend(records)
+            yield records
 
             # If we got less than page_size, we have all records
             if len(records) < page_size:
@@ -262,42 +334,56 @@ class BiztelClient:
             last_time = max(r.start_time for r in records)
             current_start = last_time + timedelta(seconds=1)
 
-        return all_records
-
+    @retry(
+        retry=retry_if_exception_type(
+            (httpx.TimeoutException, TimeoutError, BiztelRateLimitError)
+        ),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+    )
     async def download_recording(
         self,
         request_id: str,
+        file_obj: BinaryIO,
         content_type: BiztelContentType = BiztelContentType.MONAURAL,
-    ) -> bytes:
+    ) -> None:
         """
-        Download call recording from Biztel API.
+        Download call recording from Biztel API into a file.
+
+        The body is streamed in RECORDING_CHUNK_SIZE chunks, so the
+        recording is never held in memory whole. A retried attempt rewrites
+        the file from the start.
 
         Args:
             request_id: The request ID of the call
+            file_obj: Writable, seekable binary file to receive the audio
             content_type: Type of recording (monaural, left, right)
 
-        Returns:
-            Audio file content as bytes
-
         Note:
             Recordings are only available for 7 days after the call.
         """
         params = {"content_type": content_type.value}
 
-        response = await self._request(
-            "GET",
-            f"/public/api/v1/monitor/{request_id}",
-            params=params,
-        )
+        await self._rate_limit_wait()
+        file_obj.seek(0)
+        file_obj.truncate()
 
-        return response.content
+        async with asyncio.timeout(settings.BIZTEL_API_TIMEOUT):
+            async with self.http.stream(
+                "GET",
+                f"/public/api/v1/monitor/{request_id}",
+                params=params,
+            ) as response:
+                self._raise_for_status(response)
+                async for chunk in response.aiter_bytes(RECORDING_CHUNK_SIZE):
+                    file_obj.write(chunk)
 
     async def test_connection(self) -> bool:
         """Test API connection by making a simple request."""
         try:
             # Try to get a small amount of recent history
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            today = datetime.utcnow()
+            today = datetime.now(timezone.utc)
+            yesterday = today - timedelta(days=1)
             await self.get_call_history(yesterday, today, limit=1)
             return True
         except BiztelAuthError:
@@ -312,16 +398,37 @@ class BiztelClientFactory:
     _clients: dict[uuid.UUID, BiztelClient] = {}
 
     @classmethod
-    def get_client(cls, tenant_id: uuid.UUID, credentials: BiztelCredentials) -> BiztelClient:
-        """Get or create a BiztelClient for a tenant."""
-        if tenant_id not in cls._clients:
-            cls._clients[tenant_id] = BiztelClient(credentials)
-        return cls._clients[tenant_id]
+    async def get_client(
+        cls, tenant_id: uuid.UUID, credentials: BiztelCredentials
+    ) -> BiztelClient:
+        """
+        Get or create a BiztelClient for a tenant.
+
+        A cached client is replaced (and closed) when the credentials differ,
+        so settings changed through another process take effect here too.
+        """
+        client = cls._clients.get(tenant_id)
+        if client is None or client.credentials != credentials:
+            stale = client
+            client = cls._clients[tenant_id] = BiztelClient(credentials)
+            if stale is not None:
+                await stale.aclose()
+        return client
+
+    @classmethod
+    async def clear_client(cls, tenant_id: uuid.UUID) -> None:
+        """Clear and close the cached client for a tenant (e.g., when credentials change)."""
+        client = cls._clients.pop(tenant_id, None)
+        if client is not None:
+            await client.aclose()
 
     @classmethod
-    def clear_client(cls, tenant_id: uuid.UUID) -> None:
-        """Clear cached client for a tenant (e.g., when credentials change)."""
-        cls._clients.pop(tenant_id, None)
+    async def close_all(cls) -> None:
+        """Close every cached client's connections (application shutdown)."""
+        clients = list(cls._clients.values())
+        cls._clients.clear()
+        for client in clients:
+            await client.aclose()
 
 
 async def get_biztel_client_for_tenant(
@@ -340,4 +447,4 @@ async def get_biztel_client_for_tenant(
         api_secret=api_secret,
         base_url=base_url,
     )
-    return BiztelClientFactory.get_client(tenant_id, credentials)
+    return await BiztelClientFactory.get_client(tenant_id, credentials)
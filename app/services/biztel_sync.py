@@ -0,0 +1,202 @@
+import asyncio
+import tempfile
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import insert, literal_column, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.call_record import AnalysisStatus, CallRecord
+from app.models.operator import Operator
+from app.services.biztel import BiztelClient, CallHistoryRecord
+from app.services.storage import StorageService
+
+# Biztel records synced (upserted, downloaded, committed) per batch. Bounds
+# memory per sync, and at ~16 binds per row the upsert stays well under
+# asyncpg's 32767 bind-parameter limit.
+BIZTEL_SYNC_BATCH_SIZE = 500
+# Recordings fetched and uploaded in parallel per sync; the client still
+# spaces request starts by BIZTEL_API_RATE_LIMIT_DELAY
+BIZTEL_DOWNLOAD_CONCURRENCY = 8
+# Recordings are buffered in memory up to this size, then spooled to disk
+BIZTEL_RECORDING_SPOOL_SIZE = 4 * 1024 * 1024
+
+
+@dataclass
+class BiztelSyncStats:
+    """Running totals of a Biztel sync, kept current as each batch commits."""
+    total_records: int = 0
+    new_records: int = 0
+    updated_records: int = 0
+    recordings_downloaded: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+async def sync_biztel_batch(
+    db: AsyncSession,
+    client: BiztelClient,
+    storage: StorageService,
+    tenant_id: uuid.UUID,
+    history_records: list[CallHistoryRecord],
+    errors: list[str],
+) -> tuple[int, int, int]:
+    """
+    Upsert one batch of Biztel history and fetch its missing recordings.
+
+    Commits after the upsert, so the connection is released during the
+    recording downloads, and again after storing the blob paths.
+
+    Returns:
+        (new_records, updated_records, recordings_downloaded)
+    """
+    new_records = 0
+    updated_records = 0
+
+    # Preload operators instead of querying per record
+    operator_names: dict[str, str] = {}
+    for record in history_records:
+        if record.account_id and record.account_name:
+            operator_names.setdefault(record.account_id, record.account_name)
+    account_ids = {record.account_id for record in history_records if record.account_id}
+
+    operator_cache: dict[str, uuid.UUID] = {}
+    if account_ids:
+        op_result = await db.execute(
+            select(Operator.biztel_operator_id, Operator.id).where(
+                Operator.tenant_id == tenant_id,
+                Operator.biztel_operator_id.in_(account_ids),
+            )
+        )
+        operator_cache = dict(op_result.all())
+
+    new_operators = [
+        {"tenant_id": tenant_id, "biztel_operator_id": account_id, "name": name}
+        for account_id, name in operator_names.items()
+        if account_id not in operator_cache
+    ]
+    if new_operators:
+        # One multi-row INSERT; the ids come back without building ORM objects
+        op_result = await db.execute(
+            insert(Operator)
+            .values(new_operators)
+            .returning(Operator.biztel_operator_id, Operator.id)
+        )
+        operator_cache.update(op_result.all())
+
+    # One row per request_id; an upsert cannot touch the same row twice
+    call_rows: dict[str, dict[str, Any]] = {}
+    for record in history_records:
+        call_rows.setdefault(
+            record.request_id,
+            {
+                "tenant_id": tenant_id,
+                "request_id": record.request_id,
+                "event_datetime": record.start_time,
+                "caller_number": record.caller_id,
+                "callee_number": record.called_id,
+                "wait_time_seconds": record.hold_time,
+                "talk_time_seconds": record.call_time,
+                "operator_id": operator_cache.get(record.account_id) if record.account_id else None,
+                "call_center_name": record.queue_name,
+                "call_center_extension": record.queue_exten,
+                "business_label": record.business_name,
+                "event_type": record.event,
+                "analysis_status": AnalysisStatus.PENDING,
+            },
+        )
+    with_recording = {record.request_id for record in history_records if record.has_recording}
+
+    # Existing calls only get their operator refreshed; the set_updated_at
+    # trigger bumps updated_at. xmax = 0 marks rows this statement inserted
+    # rather than updated.
+    stmt = pg_insert(CallRecord).values(list(call_rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "request_id"],
+        set_={"operator_id": stmt.excluded.operator_id},
+    ).returning(
+        CallRecord.id,
+        CallRecord.request_id,
+        CallRecord.audio_file_path,
+        literal_column("xmax = 0").label("inserted"),
+    )
+    result = await db.execute(stmt)
+    pending_downloads: list[tuple[uuid.UUID, str]] = []
+    for call_id, request_id, audio_file_path, inserted in result:
+        if inserted:
+            new_records += 1
+        else:
+            updated_records += 1
+        # Queue recording download if available and not already downloaded
+        if request_id in with_recording and not audio_file_path:
+            pending_downloads.append((call_id, request_id))
+
+    # Persist the calls and release the connection before downloading
+    await db.commit()
+
+    semaphore = asyncio.Semaphore(BIZTEL_DOWNLOAD_CONCURRENCY)
+
+    async def fetch_recording(request_id: str) -> str:
+        async with semaphore:
+            # Small recordings stay in memory; larger ones spill to disk
+            with tempfile.SpooledTemporaryFile(max_size=BIZTEL_RECORDING_SPOOL_SIZE) as audio_file:
+                await client.download_recording(request_id, audio_file)
+                upload_result = await storage.upload_audio_file(
+                    file_obj=audio_file,
+                    filename=f"{request_id}.mp3",
+                    tenant_id=str(tenant_id),
+                )
+        return upload_result["blob_path"]
+
+    # Download concurrently; the session is only touched afterwards, sequentially
+    results = await asyncio.gather(
+        *(fetch_recording(request_id) for _, request_id in pending_downloads),
+        return_exceptions=True,
+    )
+    audio_paths = []
+    for (call_id, request_id), blob_path in zip(pending_downloads, results):
+        if isinstance(blob_path, Exception):
+            errors.append(f"Recording {request_id}: {str(blob_path)}")
+            continue
+        audio_paths.append({"id": call_id, "audio_file_path": blob_path})
+    if audio_paths:
+        await db.execute(update(CallRecord), audio_paths)
+        await db.commit()
+
+    return new_records, updated_records, len(audio_paths)
+
+
+async def sync_biztel_history(
+    db: AsyncSession,
+    client: BiztelClient,
+    storage: StorageService,
+    tenant_id: uuid.UUID,
+    pages: AsyncIterator[list[CallHistoryRecord]],
+    stats: BiztelSyncStats,
+) -> None:
+    """
+    Sync Biztel history pages into call_records, BIZTEL_SYNC_BATCH_SIZE at a time.
+
+    Each batch is committed before the next one starts, so if a later page
+    fails, the batches already synced are kept and stats still counts them.
+    """
+    # The batches write through Core statements; nothing should be
+    # flushed implicitly ahead of each of them
+    with db.no_autoflush:
+        async for page in pages:
+            stats.total_records += len(page)
+            for batch_start in range(0, len(page), BIZTEL_SYNC_BATCH_SIZE):
+                batch_new, batch_updated, batch_downloaded = await sync_biztel_batch(
+                    db,
+                    client,
+                    storage,
+                    tenant_id,
+                    page[batch_start:batch_start + BIZTEL_SYNC_BATCH_SIZE],
+                    stats.errors,
+                )
+                stats.new_records += batch_new
+                stats.updated_records += batch_updated
+                stats.recordings_downloaded += batch_downloaded
@@ -0,0 +1,80 @@
+import uuid
+from typing import Any
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+CACHE_KEY_PREFIX = "cqd"
+# Fail fast when Redis is unreachable; the database is always the fallback
+REDIS_SOCKET_TIMEOUT = 0.5
+
+
+class ResponseCache:
+    """
+    Redis cache for tenant-scoped, rarely changing API responses.
+
+    All entries of one namespace for one tenant live in a single Redis hash,
+    so a mutation invalidates them with one DEL and no key can be read
+    across tenants. Redis errors are swallowed: a cache outage only costs
+    the database round trip it would have saved.
+    """
+
+    def __init__(self):
+        self._redis: Redis | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            )
+        return self._redis
+
+    @staticmethod
+    def _key(namespace: str, tenant_id: uuid.UUID) -> str:
+        return f"{CACHE_KEY_PREFIX}:{namespace}:{tenant_id}"
+
+    async def get(self, namespace: str, tenant_id: uuid.UUID, field: str) -> Any | None:
+        """Return the cached JSON value, or None on a miss or Redis error."""
+        try:
+            value = await self.redis.hget(self._key(namespace, tenant_id), field)
+        except RedisError:
+            return None
+        return orjson.loads(value) if value is not None else None
+
+    async def set(self, namespace: str, tenant_id: uuid.UUID, field: str, value: Any) -> None:
+        """Cache a JSON-serializable value for RESPONSE_CACHE_TTL_SECONDS."""
+        key = self._key(namespace, tenant_id)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, orjson.dumps(value))
+                # Only the first write sets the TTL, so stale fields cannot be kept alive
+                pipe.expire(key, settings.RESPONSE_CACHE_TTL_SECONDS, nx=True)
+                await pipe.execute()
+        except RedisError:
+            pass
+
+    async def invalidate(self, namespace: str, tenant_id: uuid.UUID) -> None:
+        """Drop every cached entry of a namespace for a tenant."""
+        try:
+            await self.redis.delete(self._key(namespace, tenant_id))
+        except RedisError:
+            pass
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+# Singleton instance
+response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return response_cache
@@ -1,12 +1,79 @@
+import asyncio
+import io
+import math
+import os
+import threading
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import BinaryIO
 
+from cachetools import TLRUCache
 from google.cloud import storage
 from google.cloud.exceptions import NotFound
 
 from app.config import settings
 
+# The client library default is 256 KiB, far below where GCS throughput plateaus
+GCS_CHUNK_ALIGNMENT = 256 * 1024
+UPLOAD_CHUNK_SIZE = max(
+    GCS_CHUNK_ALIGNMENT,
+    settings.GCS_UPLOAD_CHUNK_SIZE // GCS_CHUNK_ALIGNMENT * GCS_CHUNK_ALIGNMENT,
+)
+
+# Files above this are split into parts, uploaded in parallel and composed.
+# Parts are streamed from the source file in COMPOSITE_CHUNK_SIZE requests, so
+# peak memory per upload is COMPOSITE_CHUNK_SIZE * COMPOSITE_UPLOAD_CONCURRENCY
+# regardless of the file or part size.
+COMPOSITE_UPLOAD_THRESHOLD = 20 * 1024 * 1024
+COMPOSITE_PART_SIZE = 16 * 1024 * 1024
+COMPOSITE_MAX_PARTS = 32  # GCS compose accepts at most 32 sources
+COMPOSITE_UPLOAD_CONCURRENCY = 8
+COMPOSITE_CHUNK_SIZE = 4 * GCS_CHUNK_ALIGNMENT
+
+
+def _signed_url_ttu(key: tuple[str, int, str], value: str, now: float) -> float:
+    # Reuse a signed URL for half of its validity window
+    return now + key[1] * 60 / 2
+
+
+class _FileRange(io.RawIOBase):
+    """Read-only view of ``length`` bytes at ``start`` in a shared file."""
+
+    def __init__(self, file_obj: BinaryIO, start: int, length: int, lock: threading.Lock):
+        super().__init__()
+        self._file = file_obj
+        self._start = start
+        self._length = length
+        self._lock = lock
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self._length}[whence]
+        self._pos = min(max(base + offset, 0), self._length)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._length - self._pos)
+        if n <= 0:
+            return 0
+        # Other parts read the same file concurrently, so seek+read must not interleave
+        with self._lock:
+            self._file.seek(self._start + self._pos)
+            data = self._file.read(n)
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
 
 class StorageService:
     """Google Cloud Storage service for audio file management."""
@@ -14,6 +81,7 @@ class StorageService:
     def __init__(self):
         self._client: storage.Client | None = None
         self._bucket: storage.Bucket | None = None
+        self._signed_urls: TLRUCache = TLRUCache(maxsize=10_000, ttu=_signed_url_ttu)
 
     @property
     def client(self) -> storage.Client:
@@ -31,10 +99,11 @@ class StorageService:
         self,
         tenant_id: str,
         filename: str,
+        uploaded_at: datetime,
         prefix: str = "audio",
     ) -> str:
         """Generate a unique blob path for the file."""
-        date_str = datetime.utcnow().strftime("%Y/%m/%d")
+        date_str = uploaded_at.strftime("%Y/%m/%d")
         unique_id = uuid.uuid4().hex[:8]
         extension = Path(filename).suffix
         safe_filename = f"{unique_id}{extension}"
@@ -42,7 +111,7 @@ class StorageService:
 
     async def upload_audio_file(
         self,
-        file_content: bytes,
+        file_obj: BinaryIO | bytes,
         filename: str,
         tenant_id: str,
         content_type: str = "audio/mpeg",
@@ -52,7 +121,7 @@ class StorageService:
         Upload an audio file to GCS with TTL metadata.
 
         Args:
-            file_content: The file content as bytes
+            file_obj: Readable binary file (streamed from its start) or raw bytes
             filename: Original filename
             tenant_id: Tenant ID for organizing files
             content_type: MIME type of the file
@@ -61,21 +130,35 @@ class StorageService:
         Returns:
             dict with blob_path, public_url, and signed_url
         """
-        blob_path = self._generate_blob_path(tenant_id, filename)
+        # One clock read for the path, upload time and expiry (naive UTC)
+        uploaded_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        blob_path = self._generate_blob_path(tenant_id, filename, uploaded_at)
         blob = self.bucket.blob(blob_path)
 
         # Set metadata including TTL expiration
-        expiration_date = datetime.utcnow() + timedelta(days=ttl_days)
+        expiration_date = uploaded_at + timedelta(days=ttl_days)
         blob.metadata = {
             "tenant_id": tenant_id,
             "original_filename": filename,
-            "uploaded_at": datetime.utcnow().isoformat(),
+            "uploaded_at": uploaded_at.isoformat(),
             "expires_at": expiration_date.isoformat(),
             "ttl_days": str(ttl_days),
         }
 
-        # Upload the file
-        blob.upload_from_string(file_content, content_type=content_type)
+        if isinstance(file_obj, bytes):
+            file_obj = io.BytesIO(file_obj)
+        size = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(0)
+
+        if size > COMPOSITE_UPLOAD_THRESHOLD:
+            await self._upload_composite(blob, file_obj, size, content_type)
+        else:
+            # Stream from the file; mid-sized files go up as a chunked resumable upload
+            if size > UPLOAD_CHUNK_SIZE:
+                blob.chunk_size = UPLOAD_CHUNK_SIZE
+            await asyncio.to_thread(
+                blob.upload_from_file, file_obj, size=size, content_type=content_type
+            )
 
         # Generate signed URL for temporary access
         signed_url = self.generate_signed_url(blob_path)
@@ -87,29 +170,76 @@ class StorageService:
             "expires_at": expiration_date.isoformat(),
         }
 
+    async def _upload_composite(
+        self,
+        blob: storage.Blob,
+        file_obj: BinaryIO,
+        size: int,
+        content_type: str,
+    ) -> None:
+        """
+        Upload a large file as parallel parts composed into the target blob.
+
+        Temporary part objects are deleted once composed (or on failure).
+        """
+        part_size = max(COMPOSITE_PART_SIZE, math.ceil(size / COMPOSITE_MAX_PARTS))
+        offsets = range(0, size, part_size)
+        parts = [self.bucket.blob(f"{blob.name}.parts/{i:02d}") for i in range(len(offsets))]
+        semaphore = asyncio.Semaphore(COMPOSITE_UPLOAD_CONCURRENCY)
+        read_lock = threading.Lock()
+
+        async def upload_part(part: storage.Blob, offset: int) -> None:
+            length = min(part_size, size - offset)
+            view = _FileRange(file_obj, offset, length, read_lock)
+            # A chunked resumable upload buffers one chunk at a time, not the whole part
+            part.chunk_size = COMPOSITE_CHUNK_SIZE
+            async with semaphore:
+                await asyncio.to_thread(
+                    part.upload_from_file, view, size=length, content_type=content_type
+                )
+
+        try:
+            await asyncio.gather(*(upload_part(part, offset) for part, offset in zip(parts, offsets)))
+            blob.content_type = content_type
+            await asyncio.to_thread(blob.compose, parts)
+        finally:
+            await asyncio.gather(
+                *(asyncio.to_thread(part.delete) for part in parts),
+                return_exceptions=True,
+            )
+
     def generate_signed_url(
         self,
         blob_path: str,
         expiration_minutes: int = 60,
         method: str = "GET",
+        cached: bool = True,
     ) -> str:
         """
         Generate a signed URL for temporary access to a file.
 
+        URLs are cached in-process and reused for half their validity window.
+
         Args:
             blob_path: The path to the blob in GCS
             expiration_minutes: URL validity period in minutes
             method: HTTP method (GET, PUT, etc.)
+            cached: Reuse a cached URL; pass False when the caller promises
+                the full validity period to the client
 
         Returns:
             Signed URL string
         """
-        blob = self.bucket.blob(blob_path)
-        url = blob.generate_signed_url(
-            version="v4",
-            expiration=timedelta(minutes=expiration_minutes),
-            method=method,
-        )
+        key = (blob_path, expiration_minutes, method)
+        url = self._signed_urls.get(key) if cached else None
+        if url is None:
+            blob = self.bucket.blob(blob_path)
+            url = blob.generate_signed_url(
+                version="v4",
+                expiration=timedelta(minutes=expiration_minutes),
+                method=method,
+            )
+            self._signed_urls[key] = url
         return url
 
     async def download_file(self, blob_path: str) -> bytes:
@@ -142,6 +272,19 @@ class StorageService:
         except NotFound:
             return False
 
+    async def delete_files(self, blob_paths: list[str]) -> None:
+        """
+        Delete several files from GCS in one worker thread.
+
+        delete_blobs still sends one DELETE per blob, one after another;
+        this only saves a thread hop per file. Missing blobs are ignored.
+
+        Args:
+            blob_paths: The paths to the blobs in GCS
+        """
+        blobs = [self.bucket.blob(blob_path) for blob_path in blob_paths]
+        await asyncio.to_thread(self.bucket.delete_blobs, blobs, on_error=lambda blob: None)
+
     async def file_exists(self, blob_path: str) -> bool:
         """Check if a file exists in GCS."""
         blob = self.bucket.blob(blob_path)
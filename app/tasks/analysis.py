@@ -4,21 +4,25 @@ from datetime import datetime, timedelta
 from typing import Any
 
 from celery import group, shared_task
-from sqlalchemy import select
+from sqlalchemy import Date, Integer, cast, delete, func, insert, literal_column, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.celery_app import celery_app
 from app.config import settings
+from app.database import async_database_url
 from app.models.analysis_result import AnalysisResult
 from app.models.call_record import AnalysisStatus, CallRecord
+from app.models.dashboard_stats import UNASSIGNED_OPERATOR_ID, DashboardDailyStats
 from app.models.emotion_data import EmotionData
 from app.models.operation_flow import OperationFlow
 from app.models.tenant import Tenant
+from app.models.timestamps import utcnow
 from app.services.biztel import (
     BiztelClient,
     BiztelCredentials,
     BiztelEventType,
 )
+from app.services.biztel_sync import BiztelSyncStats, sync_biztel_history
 from app.services.hume import get_hume_service
 from app.services.llm import get_llm_service
 from app.services.storage import get_storage_service
@@ -27,7 +31,7 @@ from app.services.whisper import get_whisper_service
 
 def get_async_session() -> async_sessionmaker[AsyncSession]:
     """Create async session for Celery tasks."""
-    engine = create_async_engine(settings.DATABASE_URL)
+    engine = create_async_engine(async_database_url(settings.DATABASE_URL))
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -160,7 +164,6 @@ async def _process_single_call_async(task, call_record_id: str) -> dict[str, Any
                 analysis.fillers_count = filler.get("filler_count", 0)
                 analysis.silence_duration = filler.get("silence_duration", 0)
                 analysis.summary = summary_data.get("summary")
-                analysis.updated_at = datetime.utcnow()
             else:
                 analysis = AnalysisResult(
                     call_record_id=call.id,
@@ -177,27 +180,29 @@ async def _process_single_call_async(task, call_record_id: str) -> dict[str, Any
 
             # Save emotion data if available
             if not isinstance(emotion_result, Exception):
-                # Delete existing emotion data
+                # Replace any emotion data from an earlier run
                 await db.execute(
-                    select(EmotionData).where(EmotionData.analysis_id == analysis.id)
+                    delete(EmotionData).where(EmotionData.analysis_id == analysis.id)
                 )
-                # Note: In production, use DELETE statement
-
-                for prediction in emotion_result.predictions:
-                    emotion_data = EmotionData(
-                        analysis_id=analysis.id,
-                        timestamp=prediction.start_time,
-                        emotion_type=prediction.dominant_emotion,
-                        confidence=prediction.dominant_score,
-                        audio_features={
+
+                # One executemany instead of an ORM object per prediction
+                emotion_rows = [
+                    {
+                        "analysis_id": analysis.id,
+                        "timestamp": prediction.start_time,
+                        "emotion_type": prediction.dominant_emotion,
+                        "confidence": prediction.dominant_score,
+                        "audio_features": {
                             "emotions": {e.emotion: e.score for e in prediction.emotions}
                         },
-                    )
-                    db.add(emotion_data)
+                    }
+                    for prediction in emotion_result.predictions
+                ]
+                if emotion_rows:
+                    await db.execute(insert(EmotionData), emotion_rows)
 
             # Update call status
             call.analysis_status = AnalysisStatus.COMPLETED
-            call.updated_at = datetime.utcnow()
 
             await db.commit()
 
@@ -295,6 +300,7 @@ async def _daily_biztel_sync_async(tenant_id: str | None) -> dict[str, Any]:
 
         result = await db.execute(query)
         tenants = result.scalars().all()
+        storage = get_storage_service()
 
         for tenant in tenants:
             try:
@@ -303,23 +309,29 @@ async def _daily_biztel_sync_async(tenant_id: str | None) -> dict[str, Any]:
                     api_secret=tenant.biztel_api_secret or "",
                     base_url=tenant.biztel_base_url,
                 )
-                client = BiztelClient(credentials)
-
                 # Fetch yesterday's data
                 yesterday = datetime.utcnow().replace(
                     hour=0, minute=0, second=0, microsecond=0
                 ) - timedelta(days=1)
                 today = yesterday + timedelta(days=1)
 
-                records = await client.get_call_history_paginated(
-                    start_date=yesterday,
-                    end_date=today,
-                    events=[BiztelEventType.COMPLETECALLER, BiztelEventType.COMPLETEAGENT],
-                )
+                # Each task runs its own event loop, so the client is not cached
+                stats = BiztelSyncStats()
+                async with BiztelClient(credentials) as client:
+                    pages = client.iter_call_history_pages(
+                        start_date=yesterday,
+                        end_date=today,
+                        events=[BiztelEventType.COMPLETECALLER, BiztelEventType.COMPLETEAGENT],
+                    )
+                    # Upserts each batch in one statement and stores its recordings
+                    await sync_biztel_history(db, client, storage, tenant.id, pages, stats)
 
                 results.append({
                     "tenant_id": str(tenant.id),
-                    "records_fetched": len(records),
+                    "records_fetched": stats.total_records,
+                    "new_records": stats.new_records,
+                    "recordings_downloaded": stats.recordings_downloaded,
+                    "errors": stats.errors[:20],
                     "status": "success",
                 })
 
@@ -327,6 +339,8 @@ async def _daily_biztel_sync_async(tenant_id: str | None) -> dict[str, Any]:
                 process_pending_calls.delay(str(tenant.id), limit=1000)
 
             except Exception as e:
+                # Drop a half-written batch; earlier batches are already committed
+                await db.rollback()
                 results.append({
                     "tenant_id": str(tenant.id),
                     "error": str(e),
@@ -412,3 +426,129 @@ async def _retry_failed_analyses_async(tenant_id: str | None, limit: int) -> dic
             }
 
         return {"retried_count": 0}
+
+
+@celery_app.task
+def refresh_dashboard_stats(days: int = 2) -> dict[str, Any]:
+    """
+    Recompute dashboard_daily_stats for recent days.
+
+    Re-aggregating whole days keeps the rollup correct when calls are
+    re-analyzed, and replacing the window in one transaction makes the task
+    safe to run repeatedly.
+
+    Args:
+        days: Number of days back (including today) to recompute
+
+    Returns:
+        Dict with the number of rollup rows written
+    """
+    return run_async(_refresh_dashboard_stats_async(days))
+
+
+async def _refresh_dashboard_stats_async(days: int) -> dict[str, Any]:
+    """Async implementation of refresh_dashboard_stats."""
+    async_session = get_async_session()
+    since = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(
+        days=days - 1
+    )
+
+    # Rendered as literals so the SELECT and GROUP BY expressions match exactly
+    operator_key = func.coalesce(
+        CallRecord.operator_id,
+        literal_column(f"'{UNASSIGNED_OPERATOR_ID}'::uuid"),
+    )
+    day = cast(CallRecord.event_datetime, Date)
+
+    async with async_session() as db:
+        aggregates = (
+            select(
+                CallRecord.tenant_id,
+                operator_key,
+                day,
+                func.count(CallRecord.id),
+                func.count(AnalysisResult.id),
+                func.coalesce(func.sum(AnalysisResult.overall_score), 0),
+                func.coalesce(func.sum(AnalysisResult.fillers_count), 0),
+                func.coalesce(func.sum(AnalysisResult.silence_duration), 0),
+                func.count(AnalysisResult.flow_compliance),
+                func.coalesce(func.sum(cast(AnalysisResult.flow_compliance, Integer)), 0),
+                utcnow(),
+            )
+            .outerjoin(AnalysisResult, AnalysisResult.call_record_id == CallRecord.id)
+            .where(CallRecord.event_datetime >= since)
+            .group_by(CallRecord.tenant_id, operator_key, day)
+        )
+
+        stmt = insert(DashboardDailyStats).from_select(
+            [
+                "tenant_id",
+                "operator_id",
+                "day",
+                "calls",
+                "analyzed_calls",
+                "score_sum",
+                "fillers_sum",
+                "silence_sum",
+                "compliance_checked_calls",
+                "compliant_calls",
+                "updated_at",
+            ],
+            aggregates,
+        )
+
+        # Buckets whose calls were all deleted or reassigned produce no aggregate
+        # row, so the window is replaced wholesale rather than upserted
+        await db.execute(
+            delete(DashboardDailyStats).where(DashboardDailyStats.day >= since.date())
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+
+    return {
+        "rows_written": result.rowcount,
+        "since": since.isoformat(),
+    }
+
+
+# Tables partitioned by month (see alembic revision 007)
+PARTITIONED_TABLES = ("emotion_data",)
+
+
+@celery_app.task
+def ensure_partitions(months_ahead: int = 3) -> dict[str, Any]:
+    """
+    Create upcoming monthly partitions for partitioned tables.
+
+    Args:
+        months_ahead: Number of future months to keep provisioned
+
+    Returns:
+        Dict with the tables that were checked
+    """
+    return run_async(_ensure_partitions_async(months_ahead))
+
+
+async def _ensure_partitions_async(months_ahead: int) -> dict[str, Any]:
+    """Async implementation of ensure_partitions."""
+    async_session = get_async_session()
+
+    async with async_session() as db:
+        for table in PARTITIONED_TABLES:
+            await db.execute(
+                text("""
+                    SELECT create_monthly_partition(CAST(:table AS regclass), month::date)
+                    FROM generate_series(
+                        date_trunc('month', now()),
+                        date_trunc('month', now()) + make_interval(months => :months_ahead),
+                        interval '1 month'
+                    ) AS month
+                """),
+                {"table": table, "months_ahead": months_ahead},
+            )
+        await db.commit()
+
+    return {
+        "tables": list(PARTITIONED_TABLES),
+        "months_ahead": months_ahead,
+    }
@@ -223,6 +223,38 @@ class TestGoogleAuthEndpoint:
         assert data["user"]["name"] == "New Google User"
         assert data["tokens"]["access_token"] is not None
 
+    @pytest.mark.asyncio
+    @patch("app.api.v1.auth.verify_google_token")
+    async def test_google_auth_only_first_user_in_tenant_is_admin(
+        self, mock_verify, client: AsyncClient
+    ):
+        """Test first Google user of a domain becomes admin, later users operators."""
+        mock_verify.return_value = {
+            "google_id": "first-google-id",
+            "email": "first@newdomain.example",
+            "name": "First User",
+            "email_verified": True,
+        }
+        response = await client.post(
+            "/api/auth/google",
+            json={"credential": "valid-google-token"},
+        )
+        assert response.status_code == 200
+        assert response.json()["user"]["role"] == "admin"
+
+        mock_verify.return_value = {
+            "google_id": "second-google-id",
+            "email": "second@newdomain.example",
+            "name": "Second User",
+            "email_verified": True,
+        }
+        response = await client.post(
+            "/api/auth/google",
+            json={"credential": "valid-google-token"},
+        )
+        assert response.status_code == 200
+        assert response.json()["user"]["role"] == "operator"
+
     @pytest.mark.asyncio
     @patch("app.api.v1.auth.verify_google_token")
     async def test_google_auth_existing_user_by_google_id(
@@ -403,6 +435,25 @@ class TestMeEndpoint:
         assert data["name"] == "Test User"
         assert data["role"] == UserRole.ADMIN.value
 
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_me_not_modified(self, client: AsyncClient, test_user: User, auth_headers: dict):
+        """Test /me answers a matching If-None-Match with 304.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        first = await client.get("/api/auth/me", headers=auth_headers)
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "private, max-age=30"
+
+        response = await client.get(
+            "/api/auth/me",
+            headers={**auth_headers, "If-None-Match": etag},
+        )
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
     @pytest.mark.asyncio
     async def test_me_unauthenticated(self, client: AsyncClient):
         """Test getting current user info without authentication."""
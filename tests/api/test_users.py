@@ -0,0 +1,142 @@
+"""
+API tests for user management endpoints.
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole
+
+
+async def _add_admin(
+    db_session: AsyncSession, tenant: Tenant, email: str, is_active: bool = True
+) -> User:
+    user = User(
+        id=uuid.uuid4(),
+        tenant_id=tenant.id,
+        email=email,
+        name="Other Admin",
+        role=UserRole.ADMIN,
+        is_active=is_active,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+    )
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    return user
+
+
+@pytest_asyncio.fixture
+async def second_admin(db_session: AsyncSession, test_tenant: Tenant) -> User:
+    """Create a second active admin in the test tenant."""
+    return await _add_admin(db_session, test_tenant, "admin2@example.com")
+
+
+@pytest_asyncio.fixture
+async def inactive_admin(db_session: AsyncSession, test_tenant: Tenant) -> User:
+    """Create an inactive admin in the test tenant."""
+    return await _add_admin(db_session, test_tenant, "admin-inactive@example.com", is_active=False)
+
+
+class TestUpdateUserEndpoint:
+    """Tests for PUT /api/users/{user_id} endpoint."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_demote_last_admin(self, client: AsyncClient, test_user: User, auth_headers: dict):
+        """Test the only active admin cannot be demoted.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        response = await client.put(
+            f"/api/users/{test_user.id}",
+            json={"role": UserRole.OPERATOR.value},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cannot demote the last admin"
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_demote_admin_when_another_remains(
+        self, client: AsyncClient, test_user: User, second_admin: User, auth_headers: dict
+    ):
+        """Test an admin can be demoted while another active admin remains.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        response = await client.put(
+            f"/api/users/{second_admin.id}",
+            json={"role": UserRole.OPERATOR.value},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["role"] == UserRole.OPERATOR.value
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_update_unknown_user(self, client: AsyncClient, test_user: User, auth_headers: dict):
+        """Test updating a user that does not exist returns 404.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        response = await client.put(
+            f"/api/users/{uuid.uuid4()}",
+            json={"role": UserRole.OPERATOR.value},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "User not found"
+
+
+class TestDeleteUserEndpoint:
+    """Tests for DELETE /api/users/{user_id} endpoint."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_delete_last_admin(
+        self, client: AsyncClient, test_user: User, inactive_admin: User, auth_headers: dict
+    ):
+        """Test an admin cannot be deleted when only one active admin is left.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        response = await client.delete(f"/api/users/{inactive_admin.id}", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cannot delete the last admin"
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_delete_admin_when_another_remains(
+        self, client: AsyncClient, test_user: User, second_admin: User, auth_headers: dict
+    ):
+        """Test an admin can be deleted while another active admin remains.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        response = await client.delete(f"/api/users/{second_admin.id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["message"] == "User deleted"
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_delete_unknown_user(self, client: AsyncClient, test_user: User, auth_headers: dict):
+        """Test deleting a user that does not exist returns 404.
+
+        Note: Requires PostgreSQL for UUID type handling.
+        """
+        response = await client.delete(f"/api/users/{uuid.uuid4()}", headers=auth_headers)
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "User not found"
@@ -24,6 +24,7 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy import event
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlmodel import SQLModel
 
 from app.main import app
@@ -36,6 +37,10 @@ from app.services.auth import create_tokens, get_password_hash
 # Use SQLite for testing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
+# PostgreSQL-only behaviour (partitions, ON CONFLICT, xmax) runs against this
+# database when set, e.g. postgresql+asyncpg://postgres@localhost/cqd_test
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
 engine = create_async_engine(
     TEST_DATABASE_URL,
     echo=False,
@@ -71,6 +76,39 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(SQLModel.metadata.drop_all)
 
 
+@pytest_asyncio.fixture(scope="function")
+async def pg_engine():
+    """Engine for the PostgreSQL test database; skips when none is configured."""
+    if not TEST_POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    pg = create_async_engine(TEST_POSTGRES_URL)
+    yield pg
+    await pg.dispose()
+
+
+def _create_pg_tables(conn) -> None:
+    # JSONB is patched to JSON above, which has no GIN operator classes, and
+    # the trigram indexes need pg_trgm; the tests need none of them
+    for table in SQLModel.metadata.sorted_tables:
+        conn.execute(CreateTable(table))
+        for index in table.indexes:
+            if index.dialect_options["postgresql"]["using"] != "gin":
+                conn.execute(CreateIndex(index))
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pg_session(pg_engine) -> AsyncGenerator[AsyncSession, None]:
+    """Create a fresh PostgreSQL session with the model tables for each test."""
+    async with pg_engine.begin() as conn:
+        await conn.run_sync(_create_pg_tables)
+
+    async with async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+    async with pg_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create a test client with overridden database dependency."""
@@ -19,6 +19,7 @@ from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 import pytest_asyncio
+from passlib.hash import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, UserRole
@@ -33,8 +34,12 @@ from app.services.auth import (
     decode_token,
     verify_google_token,
     authenticate_user,
+    email_exists,
     get_user_by_email,
+    get_user_by_id,
+    get_user_with_tenant_by_id,
     get_user_by_google_id,
+    get_user_for_google_login,
     create_user,
     create_tenant,
     get_or_create_tenant_for_google_user,
@@ -45,13 +50,19 @@ class TestPasswordHashing:
     """Tests for password hashing functions."""
 
     def test_get_password_hash_returns_hash(self):
-        """Test that get_password_hash returns a bcrypt hash."""
+        """Test that get_password_hash returns an argon2id hash."""
         password = "mysecretpassword"
         hashed = get_password_hash(password)
 
         assert hashed != password
-        assert hashed.startswith("$2b$")
-        assert len(hashed) == 60
+        assert hashed.startswith("$argon2id$")
+
+    def test_verify_password_legacy_bcrypt_hash(self):
+        """Test that hashes created before the argon2id switch still verify."""
+        hashed = bcrypt.hash("mysecretpassword")
+
+        assert verify_password("mysecretpassword", hashed) is True
+        assert verify_password("wrongpassword", hashed) is False
 
     def test_get_password_hash_different_for_same_password(self):
         """Test that same password produces different hashes (due to salt)."""
@@ -148,6 +159,16 @@ class TestJWTTokens:
         assert payload.sub == user_id
         assert payload.type == "refresh"
 
+    def test_decode_token_cached_until_expiry(self):
+        """Test that a cached payload is reused but not past its expiry."""
+        user_id = str(uuid.uuid4())
+        token = create_access_token(user_id)
+        payload = decode_token(token)
+
+        assert decode_token(token) is payload
+        with patch("app.services.auth.time.time", return_value=payload.exp + 1):
+            assert decode_token(token) is None
+
     def test_decode_invalid_token(self):
         """Test decoding an invalid token returns None."""
         payload = decode_token("invalid.token.here")
@@ -203,6 +224,22 @@ class TestGoogleTokenVerification:
         result = verify_google_token("")
         assert result is None
 
+    @patch("app.services.auth.google_requests.Request.__call__")
+    def test_google_certs_are_cached(self, mock_call):
+        """Test Google certificate fetches are served from cache after the first."""
+        from app.services.auth import _CachedCertsRequest, _google_certs_cache
+
+        _google_certs_cache.clear()
+        mock_call.return_value = MagicMock(status=200)
+        request = _CachedCertsRequest()
+
+        first = request("https://www.googleapis.com/oauth2/v1/certs")
+        second = request("https://www.googleapis.com/oauth2/v1/certs")
+
+        assert first is second
+        mock_call.assert_called_once()
+        _google_certs_cache.clear()
+
     @patch("app.services.auth.id_token.verify_oauth2_token")
     def test_verify_google_token_valid(self, mock_verify):
         """Test that valid Google token returns user info."""
@@ -275,6 +312,20 @@ class TestDatabaseOperations:
         assert user is not None
         assert user.email == "test@example.com"
 
+    @pytest.mark.asyncio
+    async def test_authenticate_user_upgrades_legacy_hash(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """Test that logging in with a bcrypt hash stores an argon2id hash."""
+        test_user.password_hash = bcrypt.hash("testpassword123")
+        await db_session.commit()
+
+        user = await authenticate_user(db_session, "test@example.com", "testpassword123")
+
+        assert user is not None
+        assert user.password_hash.startswith("$argon2id$")
+        assert verify_password("testpassword123", user.password_hash) is True
+
     @pytest.mark.asyncio
     async def test_authenticate_user_wrong_password(self, db_session: AsyncSession, test_user: User):
         """Test authentication with wrong password."""
@@ -295,12 +346,48 @@ class TestDatabaseOperations:
         assert user is not None
         assert user.id == test_user.id
 
+    @pytest.mark.asyncio
+    async def test_get_user_by_email_case_insensitive(self, db_session: AsyncSession, test_user: User):
+        """Test email lookup ignores case."""
+        user = await get_user_by_email(db_session, "Test@Example.COM")
+
+        assert user is not None
+        assert user.id == test_user.id
+
     @pytest.mark.asyncio
     async def test_get_user_by_email_not_exists(self, db_session: AsyncSession):
         """Test getting user by email when user doesn't exist."""
         user = await get_user_by_email(db_session, "nonexistent@example.com")
         assert user is None
 
+    @pytest.mark.asyncio
+    async def test_get_user_by_id(self, db_session: AsyncSession, test_user: User):
+        """Test getting user by primary key."""
+        user = await get_user_by_id(db_session, test_user.id)
+        assert user is not None
+        assert user.email == test_user.email
+
+        assert await get_user_by_id(db_session, uuid.uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_get_user_with_tenant_by_id(
+        self, db_session: AsyncSession, test_user: User, test_tenant: Tenant
+    ):
+        """Test getting a user together with their tenant."""
+        row = await get_user_with_tenant_by_id(db_session, test_user.id)
+        assert row is not None
+        user, tenant = row
+        assert user.id == test_user.id
+        assert tenant.id == test_tenant.id
+
+        assert await get_user_with_tenant_by_id(db_session, uuid.uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_email_exists(self, db_session: AsyncSession, test_user: User):
+        """Test email existence check is case-insensitive."""
+        assert await email_exists(db_session, "TEST@example.com") is True
+        assert await email_exists(db_session, "nobody@example.com") is False
+
     @pytest.mark.asyncio
     async def test_get_user_by_google_id_exists(self, db_session: AsyncSession, google_user: User):
         """Test getting user by Google ID when user exists."""
@@ -315,6 +402,40 @@ class TestDatabaseOperations:
         user = await get_user_by_google_id(db_session, "nonexistent-google-id")
         assert user is None
 
+    @pytest.mark.asyncio
+    async def test_get_user_for_google_login_by_google_id(
+        self, db_session: AsyncSession, google_user: User
+    ):
+        """Test Google login lookup matches by Google ID."""
+        user = await get_user_for_google_login(
+            db_session, "google-unique-id-123", "other@example.com"
+        )
+
+        assert user is not None
+        assert user.id == google_user.id
+
+    @pytest.mark.asyncio
+    async def test_get_user_for_google_login_falls_back_to_email(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        """Test Google login lookup falls back to email."""
+        user = await get_user_for_google_login(db_session, "unlinked-google-id", "test@example.com")
+
+        assert user is not None
+        assert user.id == test_user.id
+
+    @pytest.mark.asyncio
+    async def test_get_user_for_google_login_prefers_google_id(
+        self, db_session: AsyncSession, test_user: User, google_user: User
+    ):
+        """Test Google ID match wins over a different user's email match."""
+        user = await get_user_for_google_login(
+            db_session, "google-unique-id-123", "test@example.com"
+        )
+
+        assert user is not None
+        assert user.id == google_user.id
+
     @pytest.mark.asyncio
     async def test_create_user_with_password(self, db_session: AsyncSession, test_tenant: Tenant):
         """Test creating a user with password."""
@@ -0,0 +1,191 @@
+"""
+Tests for the Biztel history sync (PostgreSQL only: ON CONFLICT and xmax).
+"""
+import uuid
+from datetime import datetime
+from typing import Any, BinaryIO
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.call_record import CallRecord
+from app.models.operator import Operator
+from app.models.tenant import Tenant
+from app.services.biztel import BiztelAPIError, CallHistoryRecord
+from app.services.biztel_sync import BiztelSyncStats, sync_biztel_batch, sync_biztel_history
+
+START = datetime(2024, 1, 15, 9, 0, 0)
+
+
+def _record(
+    request_id: str, account_id: str | None = None, has_recording: bool = False
+) -> CallHistoryRecord:
+    return CallHistoryRecord(
+        request_id=request_id,
+        start_time=START,
+        caller_id="0312345678",
+        called_id="0501234567",
+        hold_time=5,
+        call_time=120,
+        account_id=account_id,
+        account_name=f"Operator {account_id}" if account_id else None,
+        queue_id=1,
+        queue_name="Support",
+        queue_exten="100",
+        business_name=None,
+        event="COMPLETEAGENT",
+        has_recording=has_recording,
+    )
+
+
+class StubBiztelClient:
+    """Records downloads; request ids in fail_ids raise instead."""
+
+    def __init__(self, fail_ids: set[str] = frozenset()):
+        self.downloaded: list[str] = []
+        self.fail_ids = fail_ids
+
+    async def download_recording(self, request_id: str, file_obj: BinaryIO) -> None:
+        if request_id in self.fail_ids:
+            raise BiztelAPIError("Recording not found", status_code=404)
+        self.downloaded.append(request_id)
+        file_obj.write(b"ID3 fake mp3")
+
+
+class StubStorage:
+    """Returns a blob path per upload without touching GCS."""
+
+    async def upload_audio_file(
+        self, file_obj: BinaryIO, filename: str, tenant_id: str, **kwargs: Any
+    ) -> dict:
+        return {"blob_path": f"{tenant_id}/{filename}"}
+
+
+async def _tenant(db: AsyncSession) -> Tenant:
+    tenant = Tenant(name="Biztel Tenant")
+    db.add(tenant)
+    await db.commit()
+    return tenant
+
+
+async def _calls(db: AsyncSession, tenant_id: uuid.UUID) -> dict[str, CallRecord]:
+    db.expire_all()
+    result = await db.execute(select(CallRecord).where(CallRecord.tenant_id == tenant_id))
+    return {call.request_id: call for call in result.scalars()}
+
+
+class TestSyncBiztelBatch:
+    """Tests for sync_biztel_batch."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_counts_new_and_existing_rows(self, pg_session: AsyncSession):
+        """New and already synced calls are counted apart; duplicates in a page count once."""
+        tenant = await _tenant(pg_session)
+        operator = Operator(tenant_id=tenant.id, biztel_operator_id="op-1", name="Operator op-1")
+        pg_session.add(operator)
+        pg_session.add(CallRecord(tenant_id=tenant.id, request_id="req-1", event_datetime=START))
+        await pg_session.commit()
+
+        client = StubBiztelClient()
+        errors: list[str] = []
+        new, updated, downloaded = await sync_biztel_batch(
+            pg_session,
+            client,
+            StubStorage(),
+            tenant.id,
+            [
+                _record("req-1", account_id="op-1", has_recording=True),
+                _record("req-2", account_id="op-2", has_recording=True),
+                _record("req-2", account_id="op-2", has_recording=True),
+                _record("req-3"),
+            ],
+            errors,
+        )
+
+        assert (new, updated, downloaded) == (2, 1, 2)
+        assert errors == []
+        assert sorted(client.downloaded) == ["req-1", "req-2"]
+
+        calls = await _calls(pg_session, tenant.id)
+        assert sorted(calls) == ["req-1", "req-2", "req-3"]
+        assert calls["req-1"].operator_id == operator.id
+        assert calls["req-2"].audio_file_path == f"{tenant.id}/req-2.mp3"
+        assert calls["req-3"].audio_file_path is None
+
+        # The unknown operator was created once and linked
+        operators = (
+            await pg_session.execute(select(Operator).where(Operator.tenant_id == tenant.id))
+        ).scalars().all()
+        op_2 = next(op for op in operators if op.biztel_operator_id == "op-2")
+        assert len(operators) == 2
+        assert calls["req-2"].operator_id == op_2.id
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_resync_only_updates(self, pg_session: AsyncSession):
+        """Syncing the same batch twice inserts nothing the second time."""
+        tenant = await _tenant(pg_session)
+        batch = [_record("req-1", has_recording=True), _record("req-2")]
+
+        first = await sync_biztel_batch(
+            pg_session, StubBiztelClient(), StubStorage(), tenant.id, batch, []
+        )
+        client = StubBiztelClient()
+        second = await sync_biztel_batch(pg_session, client, StubStorage(), tenant.id, batch, [])
+
+        assert first == (2, 0, 1)
+        # The recording is already stored, so it is not downloaded again
+        assert second == (0, 2, 0)
+        assert client.downloaded == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_failed_download_is_reported(self, pg_session: AsyncSession):
+        """A failing recording is listed in errors and leaves the call without audio."""
+        tenant = await _tenant(pg_session)
+        errors: list[str] = []
+
+        result = await sync_biztel_batch(
+            pg_session,
+            StubBiztelClient(fail_ids={"req-1"}),
+            StubStorage(),
+            tenant.id,
+            [_record("req-1", has_recording=True), _record("req-2", has_recording=True)],
+            errors,
+        )
+
+        assert result == (2, 0, 1)
+        assert len(errors) == 1 and errors[0].startswith("Recording req-1:")
+        calls = await _calls(pg_session, tenant.id)
+        assert calls["req-1"].audio_file_path is None
+        assert calls["req-2"].audio_file_path is not None
+
+
+class TestSyncBiztelHistory:
+    """Tests for sync_biztel_history."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_batches_pages_and_keeps_committed_batches(self, pg_session: AsyncSession):
+        """Pages are split into batches; batches synced before a failing page are kept."""
+        tenant = await _tenant(pg_session)
+
+        async def pages():
+            yield [_record(f"req-{i}") for i in range(3)]
+            yield [_record("req-0"), _record("req-3")]
+            raise BiztelAPIError("Biztel unavailable", status_code=503)
+
+        stats = BiztelSyncStats()
+        with patch("app.services.biztel_sync.BIZTEL_SYNC_BATCH_SIZE", 2):
+            with pytest.raises(BiztelAPIError):
+                await sync_biztel_history(
+                    pg_session, StubBiztelClient(), StubStorage(), tenant.id, pages(), stats
+                )
+
+        assert stats.total_records == 5
+        assert stats.new_records == 4
+        assert stats.updated_records == 1
+        assert sorted(await _calls(pg_session, tenant.id)) == ["req-0", "req-1", "req-2", "req-3"]
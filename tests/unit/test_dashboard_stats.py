@@ -0,0 +1,123 @@
+"""
+Tests for the dashboard_daily_stats rollup task (PostgreSQL only).
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.analysis_result import AnalysisResult
+from app.models.call_record import CallRecord
+from app.models.dashboard_stats import UNASSIGNED_OPERATOR_ID, DashboardDailyStats
+from app.models.operator import Operator
+from app.models.tenant import Tenant
+from app.tasks.analysis import _refresh_dashboard_stats_async
+
+
+async def _seed_calls(db: AsyncSession) -> tuple[uuid.UUID, uuid.UUID]:
+    tenant = Tenant(name="Stats Tenant")
+    db.add(tenant)
+    await db.flush()
+    operator = Operator(tenant_id=tenant.id, biztel_operator_id="op-1", name="Operator One")
+    db.add(operator)
+    await db.flush()
+
+    today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    calls = [
+        (today, operator.id, {
+            "overall_score": 80, "fillers_count": 2, "silence_duration": 1.5, "flow_compliance": True,
+        }),
+        (today, operator.id, None),
+        (today, None, {
+            "overall_score": 40, "fillers_count": 5, "silence_duration": 3.0, "flow_compliance": False,
+        }),
+        (today - timedelta(days=1), operator.id, {
+            "overall_score": 60, "fillers_count": 1, "silence_duration": 0.5,
+        }),
+        (today - timedelta(days=2), operator.id, None),
+    ]
+    for event_datetime, operator_id, analysis in calls:
+        call = CallRecord(tenant_id=tenant.id, event_datetime=event_datetime, operator_id=operator_id)
+        db.add(call)
+        await db.flush()
+        if analysis is not None:
+            db.add(AnalysisResult(call_record_id=call.id, **analysis))
+    await db.commit()
+    return tenant.id, operator.id
+
+
+async def _stats(db: AsyncSession) -> list[tuple]:
+    rows = await db.execute(
+        select(
+            DashboardDailyStats.operator_id,
+            DashboardDailyStats.day,
+            DashboardDailyStats.calls,
+            DashboardDailyStats.analyzed_calls,
+            DashboardDailyStats.score_sum,
+            DashboardDailyStats.fillers_sum,
+            DashboardDailyStats.silence_sum,
+            DashboardDailyStats.compliance_checked_calls,
+            DashboardDailyStats.compliant_calls,
+        ).order_by(DashboardDailyStats.day, DashboardDailyStats.operator_id)
+    )
+    return [tuple(row) for row in rows]
+
+
+class TestRefreshDashboardStats:
+    """Tests for _refresh_dashboard_stats_async."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_overlapping_reruns_give_the_same_totals(
+        self, pg_engine, pg_session: AsyncSession
+    ):
+        """Re-running over an overlapping window neither double counts nor drops days."""
+        _, operator_id = await _seed_calls(pg_session)
+        today = datetime.utcnow().date()
+
+        with patch(
+            "app.tasks.analysis.get_async_session",
+            return_value=async_sessionmaker(pg_engine, expire_on_commit=False),
+        ):
+            await _refresh_dashboard_stats_async(3)
+            first = await _stats(pg_session)
+            await _refresh_dashboard_stats_async(2)
+            await _refresh_dashboard_stats_async(3)
+            second = await _stats(pg_session)
+
+        assert first == second
+        assert first == [
+            (operator_id, today - timedelta(days=2), 1, 0, 0, 0, 0, 0, 0),
+            (operator_id, today - timedelta(days=1), 1, 1, 60, 1, 0.5, 0, 0),
+            (UNASSIGNED_OPERATOR_ID, today, 1, 1, 40, 5, 3.0, 1, 0),
+            (operator_id, today, 2, 1, 80, 2, 1.5, 1, 1),
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_buckets_without_calls_are_removed(self, pg_engine, pg_session: AsyncSession):
+        """A day whose calls were all deleted loses its stale rollup row."""
+        await _seed_calls(pg_session)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        yesterday = today - timedelta(days=1)
+
+        with patch(
+            "app.tasks.analysis.get_async_session",
+            return_value=async_sessionmaker(pg_engine, expire_on_commit=False),
+        ):
+            await _refresh_dashboard_stats_async(2)
+            yesterdays_calls = select(CallRecord.id).where(
+                CallRecord.event_datetime >= yesterday,
+                CallRecord.event_datetime < today,
+            )
+            await pg_session.execute(
+                delete(AnalysisResult).where(AnalysisResult.call_record_id.in_(yesterdays_calls))
+            )
+            await pg_session.execute(delete(CallRecord).where(CallRecord.id.in_(yesterdays_calls)))
+            await pg_session.commit()
+            await _refresh_dashboard_stats_async(2)
+
+        assert [row[1] for row in await _stats(pg_session)] == [today.date(), today.date()]
@@ -1,6 +1,7 @@
 """
 Unit tests for data models.
 """
+import time
 import uuid
 from datetime import datetime
 
@@ -8,6 +9,9 @@ import pytest
 
 from app.models.user import User, UserRole
 from app.models.tenant import Tenant
+from app.models.call_record import CallRecord
+from app.models.ids import uuid7
+from app.models.types import SmallIntEnum
 
 
 class TestUserRole:
@@ -152,3 +156,48 @@ class TestTenantModel:
         tenant = Tenant(name="Inactive Company", is_active=False)
 
         assert tenant.is_active is False
+
+
+class TestUuid7:
+    """Tests for time-ordered primary keys."""
+
+    def test_uuid7_version_and_variant(self):
+        """Test uuid7 sets RFC 9562 version and variant bits."""
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_uuid7_is_time_ordered(self):
+        """Test uuid7 values from different milliseconds sort by creation time."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+
+        assert first < second
+
+    def test_call_record_uses_uuid7(self):
+        """Test CallRecord primary keys default to uuid7."""
+        call = CallRecord(tenant_id=uuid.uuid4(), event_datetime=datetime.utcnow())
+
+        assert call.id.version == 7
+
+
+class TestSmallIntEnum:
+    """Tests for SMALLINT-backed enum columns."""
+
+    def test_codes_follow_declaration_order(self):
+        """Test enum members map to stable SMALLINT codes."""
+        column_type = SmallIntEnum(UserRole)
+
+        assert column_type.process_bind_param(UserRole.ADMIN, None) == 0
+        assert column_type.process_bind_param("executive", None) == 4
+        assert column_type.process_result_value(3, None) is UserRole.OPERATOR
+        assert column_type.max_code == 4
+
+    def test_none_passes_through(self):
+        """Test NULL values are not converted."""
+        column_type = SmallIntEnum(UserRole)
+
+        assert column_type.process_bind_param(None, None) is None
+        assert column_type.process_result_value(None, None) is None
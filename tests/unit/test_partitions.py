@@ -0,0 +1,73 @@
+"""
+Tests for the create_monthly_partition database function (PostgreSQL only).
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+MIGRATION = Path(__file__).parents[2] / "alembic" / "versions" / "021_partition_function_drains_default.py"
+
+
+def _create_monthly_partition_sql() -> str:
+    spec = importlib.util.spec_from_file_location("migration_021", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.CREATE_MONTHLY_PARTITION
+
+
+class TestCreateMonthlyPartition:
+    """Tests for partitions created after rows landed in the DEFAULT partition."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_moves_rows_out_of_default_partition(self, pg_engine):
+        """Creating a month whose rows sit in the default partition moves them across."""
+        # Everything runs in one transaction that is rolled back, DDL included
+        async with pg_engine.connect() as conn:
+            await conn.execute(text(_create_monthly_partition_sql()))
+            await conn.execute(text(
+                "CREATE TABLE part_test (id int NOT NULL, created_at timestamp NOT NULL) "
+                "PARTITION BY RANGE (created_at)"
+            ))
+            await conn.execute(text("CREATE TABLE part_test_default PARTITION OF part_test DEFAULT"))
+            await conn.execute(text(
+                "INSERT INTO part_test VALUES "
+                "(1, '2030-05-10'), (2, '2030-05-31 23:59'), (3, '2030-06-01')"
+            ))
+
+            await conn.execute(text("SELECT create_monthly_partition('part_test', '2030-05-15')"))
+            # A second call for an existing month is a no-op
+            await conn.execute(text("SELECT create_monthly_partition('part_test', '2030-05-01')"))
+
+            may = await conn.scalars(text("SELECT id FROM part_test_2030m05 ORDER BY id"))
+            default = await conn.scalars(text("SELECT id FROM part_test_default ORDER BY id"))
+            assert list(may) == [1, 2]
+            assert list(default) == [3]
+
+            # The default partition is attached again and keeps catching unknown months
+            await conn.execute(text("INSERT INTO part_test VALUES (4, '2031-01-01')"))
+            total = await conn.scalar(text("SELECT count(*) FROM part_test"))
+            assert total == 4
+
+            await conn.rollback()
+
+    @pytest.mark.asyncio
+    @pytest.mark.requires_postgres
+    async def test_creates_partition_without_default(self, pg_engine):
+        """Tables without a default partition just get the new partition."""
+        async with pg_engine.connect() as conn:
+            await conn.execute(text(_create_monthly_partition_sql()))
+            await conn.execute(text(
+                "CREATE TABLE part_test (id int NOT NULL, created_at timestamp NOT NULL) "
+                "PARTITION BY RANGE (created_at)"
+            ))
+
+            await conn.execute(text("SELECT create_monthly_partition('part_test', '2030-05-01')"))
+            await conn.execute(text("INSERT INTO part_test VALUES (1, '2030-05-10')"))
+
+            count = await conn.scalar(text("SELECT count(*) FROM part_test_2030m05"))
+            assert count == 1
+
+            await conn.rollback()